@@ -1,24 +1,127 @@
 import os
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, Menu, simpledialog
-from datetime import datetime
-from PIL import Image, ImageTk
+from tkinter import ttk, messagebox, Menu
+import base64
 import json
+import locale
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+
+from explorateur import archives, core, instrument
+from explorateur.cache import ListingCache
+from explorateur.dirsize import DirSizeScanner
+from explorateur.fileops import COPY, DELETE, MOVE, FileJob, FileOperationQueue
+from explorateur.filters import EntryFilter
+from explorateur.formatting import format_duration, format_mtime, format_size
+from explorateur.grep import ContentMatch, ContentSearch, compile_query
+from explorateur.icons import load_icon
+from explorateur.listing import Entry, make_name_matcher, stat_entry
+from explorateur.sorting import COLUMN_FIELDS, SortOrder
+from explorateur.thumbnails import THUMBNAIL_EXTENSIONS, ThumbnailCache, TypeIcons
+from explorateur.loader import DirectoryLoader
+from explorateur.preview import HEX, IMAGE, IMAGE_SIZE, PREVIEW_LINES, TEXT, PreviewLoader
+from explorateur.textindex import LiveSearch
+from explorateur.virtuallist import VirtualTreeview
+from explorateur.watcher import diff_listing, snapshot, watch
+
+# Les icônes sont cherchées à côté du script, quel que soit le dossier de lancement
+ASSETS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Variable d'environnement du mode mesure du démarrage (benchmarks/bench_startup.py)
+STARTUP_BENCH_ENV = "EXPLORATEUR_STARTUP_BENCH"
+
+# Ligne « .. » toujours affichée en tête de liste
+PARENT_ENTRY = Entry("..", True)
+
+# Délai de frappe avant de relancer la recherche en direct
+SEARCH_DEBOUNCE_MS = 150
+
+# Période de prise en compte des changements signalés par le surveillant
+WATCH_POLL_MS = 100
+SMALL_CHANGES = 64      # Au-delà, les changements sont appliqués en bloc puis la vue retriée
+PREVIEW_DELAY_MS = 30   # Regroupe les changements de sélection rapprochés (flèches)
+PREVIEW_POLL_MS = 15
+
+NAME_KEY = attrgetter("name")
+
+# Filtres prédéfinis « Modifiés < 7 j » et « > 100 Mo »
+RECENT_SECONDS = 7 * 24 * 3600
+LARGE_FILE_SIZE = 100 * 1024 * 1024
+
+# Titres des colonnes du treeview
+HEADINGS = {"#0": "Nom", "Size": "Taille", "Type": "Type", "Modified": "Modifié le"}
 
 class FileExplorer:
     def __init__(self, root):
         self.root = root
         self.root.title("Explorateur de Fichiers")
+        
+        # Instrumentation (F12) ; EXPLORATEUR_TRACE=fichier.json l'active dès le démarrage
+        if os.environ.get(instrument.TRACE_ENV):
+            instrument.recorder.enable()
+        self.load_span = self.first_batch_span = self.search_span = None
+        self.perf_after_id = None
         self.current_path = os.path.expanduser("~")
         self.favorites = self.load_favorites()
-        self.filter_ext = "*"
-        self.icon_cache = {}
+        self.entry_filter = None  # Filtre compilé (None : tout afficher)
+        self.loader = DirectoryLoader(root)
+        self.cache = ListingCache()
+        self.sort_order = SortOrder()
+        self.dir_sizes = DirSizeScanner()
+        self.size_cancel = threading.Event()
+        
+        # Listing du dossier courant gardé en mémoire pour la recherche en direct
+        self.listing = []
+        self.listing_total = 0
+        self.listing_complete = False
+        self.live_search = None
+        self.search_after_id = None
+        self.showing_listing = True  # Faux pendant l'affichage d'une recherche récursive
+        
+        # Surveillance du dossier courant : les changements arrivent par une file
+        self.watcher = None
+        self.changes = queue.Queue()
+        self.pending_changes = {}
+        self.pending_path = None  # Dossier auquel appartiennent les changements en attente
+        self.root.after(WATCH_POLL_MS, self.drain_changes)
+        
+        # Opérations groupées (copie, déplacement, suppression) dans un thread dédié
+        self.file_ops = FileOperationQueue()
+        self.clipboard = None    # (COPY ou MOVE, [chemins])
+        self.last_job = None       # Dernier travail soumis
+        self.cancelled_job = None  # Dernier travail annulé, pour Reprendre
+        
+        # Recherche dans le contenu : pool de processus créé à la première recherche
+        self.content_search = None
+        self.duplicate_finder = None
+        
+        # Aperçu : pages calculées dans un thread, gardées en LRU
+        self.previews = PreviewLoader()
+        self.preview_path = None
+        self.preview_page = None
+        self.preview_photo = None
+        self.preview_after_id = None
+        self.preview_polling = False
+        
+        # Archive parcourue comme un dossier : (archive, chemin intérieur), sinon None
+        self.archive = None
+        self.extractor = None
         
         # Configuration de la fenêtre
         self.root.geometry("1000x700")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.setup_icons()
         self.create_widgets()
-        self.load_content()
+        
+        # Premier listing lancé une fois la fenêtre affichée
+        self.root.after_idle(self.load_content)
         
         # Initialisation des piles d'historique
         self.history = []       # Historique des chemins visités
@@ -28,19 +131,57 @@ class FileExplorer:
         
     
         
+    def probe_startup(self):
+        """Mode mesure : écrit les instants d'affichage de la fenêtre et des premières lignes, puis quitte"""
+        marks = {}
+        
+        def mark(name):
+            if name not in marks:
+                marks[name] = time.time()
+                print(f"{name} {marks[name]:.6f}", flush=True)
+            if len(marks) == 2:
+                self.root.after(0, self.on_close)
+        
+        insert_entries = self.insert_entries
+        
+        def insert_and_mark(entries):
+            insert_entries(entries)
+            self.root.update_idletasks()  # Lignes réellement dessinées
+            mark("first_row")
+        
+        self.insert_entries = insert_and_mark
+        self.root.bind("<Map>", lambda e: mark("window") if e.widget is self.root else None, add="+")
+    
+    def on_close(self):
+        """Arrête les travaux en arrière-plan puis ferme la fenêtre"""
+        self.loader.cancel()
+        self.size_cancel.set()
+        if self.watcher is not None:
+            self.watcher.stop()
+        self.thumbnails.shutdown()
+        if self.content_search is not None:
+            self.content_search.shutdown()
+        self.previews.shutdown()
+        if self.extractor is not None:
+            self.extractor.shutdown(wait=False, cancel_futures=True)
+        archives.cleanup()
+        trace_path = os.environ.get(instrument.TRACE_ENV)
+        if trace_path and instrument.recorder.enabled:
+            instrument.export_chrome_trace(trace_path)
+        self.root.destroy()
+    
+    @instrument.timed("icônes")
     def setup_icons(self):
         """Crée des icônes pour les dossiers et fichiers"""
-        try:
-            # Icône dossier
-            folder_img = Image.open("folder_icon.jpg") if os.path.exists("folder_icon.jpg") else Image.new('RGB', (16, 16), 'blue')
-            self.folder_icon = ImageTk.PhotoImage(folder_img.resize((16, 16)))
-            
-            # Icône fichier
-            file_img = Image.open("file_icon.png") if os.path.exists("file_icon.png") else Image.new('RGB', (16, 16), 'gray')
-            self.file_icon = ImageTk.PhotoImage(file_img.resize((16, 16)))
-        except:
-            self.folder_icon = None
-            self.file_icon = None
+        # PNG 16×16 pré-réduits : pas de décodage du JPEG d'origine ni d'import de PIL
+        self.folder_icon = load_icon(os.path.join(ASSETS_DIR, "folder_icon.jpg"),
+                                     os.path.join(ASSETS_DIR, "folder_icon_16.png"), "blue")
+        self.file_icon = load_icon(os.path.join(ASSETS_DIR, "file_icon.png"),
+                                   os.path.join(ASSETS_DIR, "file_icon_16.png"), "gray")
+        
+        # Icônes par type d'extension et miniatures des images (rendues hors du thread Tk)
+        self.type_icons = TypeIcons(self.file_icon)
+        self.thumbnails = ThumbnailCache()
     
     def create_widgets(self):
         """Crée tous les widgets de l'interface"""
@@ -51,14 +192,17 @@ class FileExplorer:
         ttk.Button(toolbar, text="←", command=self.go_back).pack(side="left")
         ttk.Button(toolbar, text="→", command=self.go_forward).pack(side="left")
         ttk.Button(toolbar, text="↑", command=self.go_up).pack(side="left")
-        ttk.Button(toolbar, text="Actualiser", command=self.load_content).pack(side="left", padx=5)
+        ttk.Button(toolbar, text="Actualiser", command=self.refresh).pack(side="left", padx=5)
         ttk.Button(toolbar, text="Nouveau dossier", command=self.create_folder).pack(side="left", padx=5)
+        ttk.Button(toolbar, text="Doublons", command=self.find_duplicates).pack(side="left", padx=5)
         
         # Barre de recherche
         search_frame = ttk.Frame(toolbar)
         search_frame.pack(side="right", padx=5)
         self.search_entry = tk.Entry(search_frame, font=("Arial", 12), width=25)
         self.search_entry.pack(padx=10, pady=5, side="left")
+        self.search_entry.bind("<KeyRelease>", self.on_search_key)
+        self.search_entry.bind("<Return>", lambda e: self.search())
         
         # Bouton Rechercher
         ttk.Button(
@@ -67,6 +211,9 @@ class FileExplorer:
         command=self.search  # Appel direct
         ).pack(side="left", padx=2)
         
+        # Recherche dans le contenu des fichiers (« re: » en tête pour une regex)
+        ttk.Button(search_frame, text="Contenu", command=self.grep_content).pack(side="left", padx=2)
+        
         # Bouton Annuler
         ttk.Button(
             search_frame,
@@ -75,6 +222,14 @@ class FileExplorer:
             command=self.cancel_search
         ).pack(side="left")
         
+        # Recherche récursive via l'index persistant
+        self.recursive_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            search_frame,
+            text="Sous-dossiers",
+            variable=self.recursive_var
+        ).pack(side="left", padx=2)
+        
         # Barre de chemin
         self.path_var = tk.StringVar()
         path_frame = ttk.Frame(self.root)
@@ -95,6 +250,10 @@ class FileExplorer:
         ttk.Button(filter_frame, text="Tous", command=lambda: self.set_filter("*")).pack(side="left", padx=5)
         ttk.Button(filter_frame, text="Images", command=lambda: self.set_filter(".jpg;.png;.gif")).pack(side="left", padx=5)
         ttk.Button(filter_frame, text="Documents", command=lambda: self.set_filter(".txt;.pdf;.docx")).pack(side="left", padx=5)
+        ttk.Button(filter_frame, text="Modifiés < 7 j",
+                   command=lambda: self.set_filter(EntryFilter.modified_within(RECENT_SECONDS), combine=True)).pack(side="left", padx=5)
+        ttk.Button(filter_frame, text="> 100 Mo",
+                   command=lambda: self.set_filter(EntryFilter(min_size=LARGE_FILE_SIZE), combine=True)).pack(side="left", padx=5)
         
         # Panneau principal
         main_panel = ttk.PanedWindow(self.root, orient="horizontal")
@@ -118,20 +277,24 @@ class FileExplorer:
         main_panel.add(content_frame, weight=1)
         
         # Treeview avec barre de défilement
-        self.tree = ttk.Treeview(content_frame, columns=("Size", "Type", "Modified"), selectmode="browse")
-        self.tree.heading("#0", text="Nom", anchor="w")
-        self.tree.heading("Size", text="Taille", anchor="w")
-        self.tree.heading("Type", text="Type", anchor="w")
-        self.tree.heading("Modified", text="Modifié le", anchor="w")
+        self.tree = ttk.Treeview(content_frame, columns=("Size", "Type", "Modified"), selectmode="extended")
+        # En-têtes cliquables : clic = tri par la colonne, Maj+clic = clé secondaire
+        for column, title in HEADINGS.items():
+            self.tree.heading(column, text=title, anchor="w",
+                              command=lambda c=column: self.sort_by(c))
+        self.tree.bind("<Shift-Button-1>", self.on_heading_shift_click)
+        self.update_headings()
         
         self.tree.column("#0", width=300)
         self.tree.column("Size", width=100)
         self.tree.column("Type", width=100)
         self.tree.column("Modified", width=150)
         
-        vsb = ttk.Scrollbar(content_frame, orient="vertical", command=self.tree.yview)
+        # Défilement vertical piloté par le modèle virtuel (seules les lignes visibles existent)
+        vsb = ttk.Scrollbar(content_frame, orient="vertical")
         hsb = ttk.Scrollbar(content_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree.configure(xscrollcommand=hsb.set)
+        self.view = VirtualTreeview(self.tree, vsb, self.render_entry)
         
         self.tree.grid(row=0, column=0, sticky="nsew")
         vsb.grid(row=0, column=1, sticky="ns")
@@ -140,15 +303,55 @@ class FileExplorer:
         content_frame.grid_columnconfigure(0, weight=1)
         content_frame.grid_rowconfigure(0, weight=1)
         
+        # Aperçu du fichier sélectionné (texte, hexadécimal ou image)
+        preview_frame = ttk.LabelFrame(main_panel, text="Aperçu")
+        main_panel.add(preview_frame, weight=1)
+        mode_bar = ttk.Frame(preview_frame)
+        mode_bar.pack(fill="x")
+        self.preview_mode = tk.StringVar(value="auto")
+        for value, label in (("auto", "Auto"), (TEXT, "Texte"), (HEX, "Hexa")):
+            ttk.Radiobutton(mode_bar, text=label, value=value, variable=self.preview_mode,
+                            command=self.on_preview_mode).pack(side="left")
+        self.preview_info = tk.StringVar()
+        ttk.Label(preview_frame, textvariable=self.preview_info).pack(fill="x", padx=2)
+        self.preview_body = ttk.Frame(preview_frame)
+        self.preview_body.pack(fill="both", expand=True)
+        self.preview_text = tk.Text(self.preview_body, wrap="none", width=48, font=("Courier", 9),
+                                    state="disabled")
+        self.preview_scroll = ttk.Scrollbar(self.preview_body, orient="vertical",
+                                            command=self.on_preview_scroll)
+        self.preview_image = ttk.Label(self.preview_body, anchor="center")
+        self.preview_text.bind("<MouseWheel>",
+                               lambda e: self.scroll_preview(-3 if e.delta > 0 else 3))
+        self.preview_text.bind("<Button-4>", lambda e: self.scroll_preview(-3))
+        self.preview_text.bind("<Button-5>", lambda e: self.scroll_preview(3))
+        self.tree.bind("<<TreeviewSelect>>", self.on_selection_changed, add="+")
+        
         # Barre de statut
         self.status_var = tk.StringVar()
-        status_bar = ttk.Label(self.root, textvariable=self.status_var, relief="sunken")
-        status_bar.pack(fill="x", padx=5, pady=5)
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(fill="x", padx=5, pady=5)
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, relief="sunken")
+        status_bar.pack(side="left", fill="x", expand=True)
+        ttk.Button(status_frame, text="Reprendre", command=self.resume_job).pack(side="right")
+        ttk.Button(status_frame, text="Annuler l'opération", command=self.cancel_job).pack(side="right", padx=5)
+        
+        # Mesures de performance, affichées sous la barre de statut (F12)
+        self.perf_var = tk.StringVar()
+        self.perf_label = ttk.Label(self.root, textvariable=self.perf_var, justify="left",
+                                    font=("Courier", 9))
+        self.root.bind("<F12>", lambda e: self.toggle_instrumentation())
+        self.root.bind("<Control-F12>", lambda e: self.export_trace())
+        if instrument.recorder.enabled:
+            self.show_perf_readout()
         
         # Menu contextuel
         self.context_menu = Menu(self.root, tearoff=0)
         self.context_menu.add_command(label="Ouvrir", command=self.open_selected)
         self.context_menu.add_command(label="Ajouter aux favoris", command=self.add_to_favorites)
+        self.context_menu.add_command(label="Copier", command=lambda: self.copy_selection(COPY))
+        self.context_menu.add_command(label="Couper", command=lambda: self.copy_selection(MOVE))
+        self.context_menu.add_command(label="Coller", command=self.paste)
         self.context_menu.add_command(label="Renommer", command=self.rename_item)
         self.context_menu.add_command(label="Supprimer", command=self.delete_item)
         self.context_menu.add_separator()
@@ -156,57 +359,221 @@ class FileExplorer:
         
         self.tree.bind("<Double-1>", self.on_double_click)
         self.tree.bind("<Button-3>", self.show_context_menu)
+        self.tree.bind("<Control-c>", lambda e: self.copy_selection(COPY))
+        self.tree.bind("<Control-x>", lambda e: self.copy_selection(MOVE))
+        self.tree.bind("<Control-v>", lambda e: self.paste())
+        self.tree.bind("<Delete>", lambda e: self.delete_item())
     
     def search(self):
         """Filtre les éléments en fonction de la recherche."""
         query = self.search_entry.get().lower()
+        if not self.recursive_var.get():
+            self.live_filter()
+            return
+        if not query:
+            self.cancel_search()
+            return
+        self.clear_tree()
+        self.showing_listing = False
+        self.search_span = instrument.begin("recherche")
+        
+        # Recherche dans toute l'arborescence via l'index, en arrière-plan
+        self.status_var.set(f"Recherche de: {query}...")
+        self.loader.load(self.current_path,
+                         on_batch=self.view.extend,
+                         on_done=lambda total: self.on_search_done(query),
+                         on_error=self.on_search_error,
+                         source=lambda path, cancel: core.search_index(path, query, cancel=cancel))
+
+    def grep_content(self):
+        """Cherche le texte de la barre de recherche dans les fichiers du dossier et de ses sous-dossiers"""
+        query = self.search_entry.get()
+        regex = query.startswith("re:")
+        if regex:
+            query = query[3:]
         if not query:
-            self.load_content()
             return
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
         try:
-            # Ajouter le dossier parent (..)
-            self.tree.insert("", "end", text="..", values=("", "Dossier", ""), 
-                            image=self.folder_icon, tags=("dir",))
-            
-            # Recherche dans le dossier courant
-            for item in os.listdir(self.current_path):
-                if query in item.lower():
-                    full_path = os.path.join(self.current_path, item)
-                    
-                    if os.path.isdir(full_path):
-                        # Dossier - utiliser l'icône dossier
-                        self.tree.insert("", "end", 
-                                    text=item,
-                                    values=("", "Dossier", ""),
-                                    image=self.folder_icon,
-                                    tags=("dir",))
-                    else:
-                        # Fichier - utiliser l'icône fichier
-                        size = os.path.getsize(full_path)
-                        mtime = datetime.fromtimestamp(os.path.getmtime(full_path)).strftime("%Y-%m-%d %H:%M")
-                        ext = os.path.splitext(item)[1][1:].upper() or "Fichier"
-                        
-                        self.tree.insert("", "end",
-                                    text=item,
-                                    values=(self.format_size(size), ext, mtime),
-                                    image=self.file_icon,
-                                    tags=("file",))
-            self.status_var.set(f"Résultats pour: {query}")
-                            
-        except PermissionError:
+            compile_query(query, regex)  # Regex invalide signalée ici, pas dans le thread
+        except re.error as e:
+            messagebox.showerror("Erreur", f"Expression régulière invalide: {e}")
+            return
+        if self.content_search is None:
+            self.content_search = ContentSearch()
+        searcher = self.content_search
+        self.clear_tree()
+        self.showing_listing = False
+        self.status_var.set(f"Recherche de « {query} » dans les fichiers...")
+        self.loader.load(self.current_path,
+                         on_batch=self.on_grep_batch,
+                         on_done=lambda total: self.on_grep_done(query, total),
+                         on_error=self.on_search_error,
+                         source=lambda path, cancel: core.search_content(
+                             path, query, regex, accept=self.entry_filter, cancel=cancel,
+                             searcher=searcher))
+    
+    def on_grep_batch(self, batch):
+        """Affiche les lignes trouvées au fil de l'eau, avec le débit"""
+        self.view.extend(batch)
+        searcher = self.content_search
+        self.status_var.set(f"{len(self.view.rows)} lignes trouvées — "
+                            f"{searcher.files_scanned} fichiers, {format_size(searcher.rate)}/s")
+    
+    def on_grep_done(self, query, total):
+        """Fin de la recherche dans le contenu : tri et bilan"""
+        self.resort_view()
+        searcher = self.content_search
+        files = len({entry.name for entry in self.view.rows if entry is not PARENT_ENTRY})
+        text = (f"« {query} » : {total} lignes dans {files} fichiers — "
+                f"{format_size(searcher.bytes_scanned)} lus à {format_size(searcher.rate)}/s")
+        if searcher.truncated:
+            text += " (résultats tronqués)"
+        if searcher.skipped:
+            text += f" — {searcher.skipped} fichiers trop gros ignorés"
+        self.status_var.set(text)
+    
+    def find_duplicates(self):
+        """Liste les fichiers en double sous le dossier courant, groupe par groupe"""
+        from explorateur.duplicates import DuplicateFinder  # sqlite3 : importé au premier usage
+        if self.duplicate_finder is None:
+            self.duplicate_finder = DuplicateFinder()
+        finder = self.duplicate_finder
+        self.clear_tree()
+        self.showing_listing = False
+        self.status_var.set("Recherche des doublons...")
+        self.loader.load(self.current_path,
+                         on_batch=self.on_duplicates_batch,
+                         on_done=lambda total: self.on_duplicates_done(),
+                         on_error=self.on_search_error,
+                         source=lambda path, cancel: core.find_duplicates(
+                             path, accept=self.entry_filter, cancel=cancel, finder=finder))
+        self.show_duplicates_progress()
+    
+    def show_duplicates_progress(self):
+        """Étape en cours pendant le parcours et le hachage, avant les premiers groupes"""
+        finder = self.duplicate_finder
+        if self.showing_listing or not self.loader.busy or finder.groups:
+            return
+        self.status_var.set(f"Doublons : {finder.stage} — {finder.files_seen} fichiers, "
+                            f"{format_size(finder.bytes_hashed)} hachés")
+        self.root.after(250, self.show_duplicates_progress)
+    
+    def on_duplicates_batch(self, batch):
+        """Affiche les groupes confirmés au fil du hachage"""
+        self.view.extend(batch)
+        finder = self.duplicate_finder
+        self.status_var.set(f"{finder.groups} groupes de doublons — "
+                            f"{format_size(finder.wasted)} récupérables ({finder.stage}...)")
+    
+    def on_duplicates_done(self):
+        """Bilan de la recherche de doublons"""
+        finder = self.duplicate_finder
+        text = (f"{finder.groups} groupes de doublons — {format_size(finder.wasted)} récupérables "
+                f"({finder.files_seen} fichiers examinés")
+        if finder.hardlinks:
+            text += f", {finder.hardlinks} liens physiques ignorés"
+        self.status_var.set(text + ")")
+    
+    def prune_results(self):
+        """Retire des résultats affichés les fichiers supprimés ou déplacés"""
+        rows = [entry for entry in self.view.rows if entry is PARENT_ENTRY
+                or os.path.lexists(os.path.join(self.current_path, entry.name))]
+        if self.duplicate_finder is not None:
+            from explorateur.duplicates import DuplicateEntry, prune_groups
+            if any(isinstance(entry, DuplicateEntry) for entry in rows):
+                rows = [PARENT_ENTRY] + prune_groups([e for e in rows if e is not PARENT_ENTRY])
+        self.view.reorder(rows)
+    
+    def toggle_instrumentation(self):
+        """F12 : active ou coupe les mesures et leur affichage"""
+        if instrument.recorder.enabled:
+            instrument.recorder.disable()
+            self.perf_label.pack_forget()
+            if self.perf_after_id is not None:
+                self.root.after_cancel(self.perf_after_id)
+                self.perf_after_id = None
+        else:
+            instrument.recorder.reset()
+            instrument.recorder.enable()
+            self.show_perf_readout()
+    
+    def show_perf_readout(self):
+        """Rafraîchit le résumé des mesures deux fois par seconde"""
+        if not self.perf_label.winfo_ismapped():
+            self.perf_label.pack(fill="x", padx=5, pady=(0, 5))
+        lines = instrument.summary(limit=6)
+        self.perf_var.set("\n".join(lines) or "Mesures actives (F12 : arrêter, Ctrl+F12 : exporter)")
+        self.perf_after_id = self.root.after(500, self.show_perf_readout)
+    
+    def export_trace(self):
+        """Ctrl+F12 : enregistre les mesures au format Chrome trace"""
+        if not instrument.recorder.enabled:
+            self.status_var.set("Mesures inactives : F12 pour les activer")
+            return
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(defaultextension=".json",
+                                            initialfile="explorateur-trace.json",
+                                            filetypes=[("Trace JSON", "*.json")])
+        if path:
+            n = instrument.export_chrome_trace(path)
+            self.status_var.set(f"Trace enregistrée: {path} ({n} événements)")
+    
+    def on_search_done(self, query):
+        """Fin de la recherche récursive : tri des résultats"""
+        instrument.end(self.search_span, len(self.view.rows) - 1)
+        self.search_span = None
+        self.resort_view()
+        self.status_var.set(f"Résultats pour: {query}")
+
+    def on_search_key(self, event):
+        """Relance le filtrage en direct après une courte pause de frappe"""
+        if event.keysym == "Return":
+            return
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.live_filter)
+
+    def live_filter(self):
+        """Filtre le listing en mémoire avec le texte de la barre de recherche"""
+        self.search_after_id = None
+        if not self.showing_listing:
+            # Résultats d'une recherche affichés : l'arrêter, sinon ses lots suivants
+            # s'ajouteraient au listing filtré
+            self.loader.cancel()
+            self.search_span = None
+            if not self.listing_complete:
+                self.load_content()  # Listing interrompu par la recherche (filtré à la fin)
+                return
+        query = self.search_entry.get().lower()
+        with instrument.span("filtre") as span:
+            if self.live_search is None:
+                self.live_search = LiveSearch(self.listing)
+            matches = self.live_search.update(query)
+            span.add(len(self.listing))
+        self.sort_order.sort(matches)
+        self.view.set_rows([PARENT_ENTRY] + matches)
+        self.showing_listing = True
+        if query:
+            self.status_var.set(f"Résultats pour: {query} ({len(matches)})")
+        elif self.listing_complete:
+            self.status_var.set(f"{self.listing_total} éléments")
+
+    def on_search_error(self, error):
+        """Affiche l'échec d'une recherche et recharge le dossier"""
+        self.search_span = None
+        if isinstance(error, PermissionError):
             messagebox.showerror("Erreur", "Accès refusé à ce dossier.")
-            self.load_content()
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Échec de la recherche: {str(e)}")
-            self.load_content()
+        else:
+            messagebox.showerror("Erreur", f"Échec de la recherche: {str(error)}")
+        self.load_content()
 
     def cancel_search(self):
-        """Annule la recherche et réaffiche tout"""
+        """Annule la recherche et réaffiche tout depuis la mémoire"""
         self.search_entry.delete(0, tk.END)
-        self.load_content()
+        if self.listing_complete:
+            self.live_filter()
+        else:
+            self.load_content()
         
     def load_favorites(self):
         """Charge les favoris depuis un fichier JSON"""
@@ -231,13 +598,15 @@ class FileExplorer:
         """Ajoute l'élément sélectionné aux favoris"""
         selected = self.tree.selection()
         if selected:
-            item = self.tree.item(selected[0])
-            path = os.path.join(self.current_path, item["text"])
+            # Le nom de l'entrée, pas le texte de la ligne (« chemin:ligne » dans le contenu)
+            entry = self.view.record(selected[0])
+            name = self.tree.item(selected[0], "text") if entry is None else entry.name
+            path = os.path.normpath(os.path.join(self.current_path, name))
             if path not in self.favorites:
                 self.favorites.append(path)
                 self.save_favorites()
                 self.update_favorites_list()
-                messagebox.showinfo("Favoris", f"{item['text']} ajouté aux favoris")
+                messagebox.showinfo("Favoris", f"{name} ajouté aux favoris")
 
     def on_fav_double_click(self, event):
         """Navigation vers un favori"""
@@ -252,20 +621,28 @@ class FileExplorer:
                 self.save_favorites()
                 self.update_favorites_list()
 
-    def set_filter(self, ext):
-        """Définit un filtre pour les extensions de fichiers"""
-        self.filter_ext = ext
+    def set_filter(self, spec, combine=False):
+        """Définit le filtre : spécification « .jpg;.png » / glob, ou EntryFilter
+        
+        Avec combine, le filtre s'ajoute (ET) au filtre courant.
+        """
+        if isinstance(spec, str):
+            spec = EntryFilter.parse(spec)
+        if combine and spec is not None:
+            spec = spec & self.entry_filter
+        self.entry_filter = spec
         self.load_content()
     
     def browse_folder(self):
         """Ouvre une boîte de dialogue pour choisir un dossier"""
+        from tkinter import filedialog
         folder = filedialog.askdirectory(initialdir=self.current_path)
         if folder:
             self.navigate_to(folder)
     
     def navigate_to(self, path):
         """Navigue vers le chemin spécifié et met à jour l'historique"""
-        if os.path.exists(path):
+        if self.path_exists(path):
             path = os.path.abspath(path)
         
             # Si on navigue vers un nouveau chemin (pas via back/forward)
@@ -322,121 +699,554 @@ class FileExplorer:
     def go_up(self):
         """Remonte d'un niveau dans l'arborescence"""
         parent = os.path.dirname(self.current_path)
-        if os.path.exists(parent):
+        if self.path_exists(parent):
             self.navigate_to(parent)
     
+    def path_exists(self, path):
+        """Dossier réel, ou archive et dossier intérieur d'une archive"""
+        return os.path.exists(path) or archives.split_archive_path(os.path.abspath(path)) is not None
+    
+    def in_archive(self):
+        """Vrai (avec un message) quand le dossier courant est dans une archive, en lecture seule"""
+        if self.archive is None:
+            return False
+        self.status_var.set("Archive en lecture seule")
+        return True
+    
     def load_content(self):
         """Charge le contenu du dossier courant"""
+        # Mesures : dossier complet et premier lot affiché (désactivées par défaut)
+        self.load_span = instrument.begin("chargement")
+        self.first_batch_span = instrument.begin("premier lot")
+        
         # Vider le treeview
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.clear_tree()
         
-        # Ajouter le dossier parent (..)
-        self.tree.insert("", "end", text="..", values=("", "Dossier", ""), 
-                        image=self.folder_icon, tags=("dir",))
+        self.listing = []
+        self.listing_complete = False
+        self.live_search = None
+        self.showing_listing = True
+        if self.pending_changes:
+            # Changements abandonnés : le listing en cache ne les contient pas
+            self.cache.discard(self.pending_path)
+        self.pending_changes = {}
+        self.archive = archives.split_archive_path(self.current_path)
+        self.watch_current()
+        self.size_cancel.set()
+        self.thumbnails.cancel_pending()
+        accept = self.entry_filter
+        
+        # Listing encore valide en cache : réaffichage immédiat depuis la mémoire
+        cached = self.cache.get(self.current_path)
+        if cached is not None:
+            self.loader.cancel()
+            self.insert_entries(cached if accept is None else list(filter(accept, cached)))
+            self.on_load_done(len(cached))
+            return
+        
+        # Sinon lister le contenu du dossier dans un thread, par lots
+        self.status_var.set("Chargement...")
+        self.loader.load(self.current_path,
+                         on_batch=self.insert_entries,
+                         on_done=self.on_load_done,
+                         on_error=self.on_load_error,
+                         accept=accept,
+                         source=self.cache.scan if self.archive is None else archives.list_archive)
+    
+    def on_load_done(self, total):
+        """Fin du chargement : le listing en mémoire est complet"""
+        instrument.end(self.load_span, total)
+        self.load_span = None
+        self.listing_total = total
+        self.listing_complete = True
+        self.listing.sort(key=NAME_KEY)  # Lots reçus dans l'ordre de readdir
+        self.live_search = None
+        if self.search_entry.get():
+            self.live_filter()
+        else:
+            self.resort_view()
+            self.status_var.set(f"{total} éléments")
         
+        # Tailles récursives des sous-dossiers, affichées au fur et à mesure
+        # (dans une archive, l'index les donne déjà)
+        self.size_cancel = threading.Event()
+        if self.archive is not None:
+            return
+        self.dir_sizes.compute(self.current_path, self.listing, self.size_cancel,
+                               token=self.current_path)
+        
+        # Préchargement du dossier parent et des favoris pour une navigation instantanée
+        self.cache.prefetch([os.path.dirname(self.current_path)] + self.favorites)
+    
+    def refresh(self):
+        """Actualise le dossier courant en n'appliquant que les différences"""
+        if not self.listing_complete or not self.showing_listing or self.archive is not None:
+            self.load_content()
+            return
+        path = self.current_path
+        old = snapshot(self.listing)
+        accept = self.entry_filter
+        
+        def rescan():
+            try:
+                new = [e for e in self.cache.scan(path) if accept is None or accept(e)]
+            except OSError:
+                return
+            self.changes.put((path, diff_listing(old, new)))
+        
+        threading.Thread(target=rescan, daemon=True).start()
+    
+    def watch_current(self):
+        """Surveille le dossier courant (un seul surveillant à la fois)"""
+        if self.watcher is not None:
+            if self.watcher.path == self.current_path:
+                return
+            self.watcher.stop()
+            self.watcher = None
+        if self.archive is not None:
+            return  # Archive : rien à surveiller, « Actualiser » relit l'index
+        path = self.current_path
         try:
-            # Lister le contenu du dossier
-            for item in sorted(os.listdir(self.current_path)):
-                full_path = os.path.join(self.current_path, item)
-                
-                # Vérifier le filtre
-                if self.filter_ext != "*":
-                    if os.path.isfile(full_path):
-                        ext = os.path.splitext(item)[1].lower()
-                        if ext not in self.filter_ext.split(";"):
-                            continue
-                
-                if os.path.isdir(full_path):
-                    self.tree.insert("", "end", text=item, values=("", "Dossier", ""), 
-                                    image=self.folder_icon, tags=("dir",))
-                else:
-                    size = os.path.getsize(full_path)
-                    mtime = datetime.fromtimestamp(os.path.getmtime(full_path)).strftime("%Y-%m-%d %H:%M")
-                    ext = os.path.splitext(item)[1][1:].upper() or "Fichier"
-                    self.tree.insert("", "end", text=item, 
-                                    values=(self.format_size(size), ext, mtime), 
-                                    image=self.file_icon, tags=("file",))
-            
-            self.status_var.set(f"{len(os.listdir(self.current_path))} éléments")
-        except PermissionError:
+            self.watcher = watch(path, lambda changes: self.changes.put((path, changes)))
+        except OSError:
+            self.watcher = None
+    
+    def drain_changes(self):
+        """Récupère les changements signalés et les applique une fois le listing complet"""
+        rescan = False
+        while True:
+            try:
+                path, changes = self.changes.get_nowait()
+            except queue.Empty:
+                break
+            if path != self.current_path:
+                # Changement d'un dossier quitté entre-temps : jamais appliqué à son cache
+                self.cache.discard(path)
+                continue
+            if changes is None:
+                rescan = True
+            else:
+                self.pending_changes.update(changes)
+                self.pending_path = path
+        repaint = False
+        while True:
+            try:
+                path, entry, total = self.dir_sizes.results.get_nowait()
+            except queue.Empty:
+                break
+            if path == self.current_path:
+                entry.size = total
+                repaint = True
+        if self.thumbnails.collect():
+            repaint = True
+        if repaint:
+            self.view.refresh(force=True)
+        if self.listing_complete:
+            if rescan:
+                self.refresh()
+            if self.pending_changes:
+                changes, self.pending_changes = self.pending_changes, {}
+                self.apply_changes(changes)
+        self.show_job_progress()
+        self.root.after(WATCH_POLL_MS, self.drain_changes)
+    
+    def apply_changes(self, changes):
+        """Met à jour les seules lignes touchées : {nom: Entry, ou None si supprimé}
+        
+        Un petit lot (opération locale, quelques fichiers modifiés) est placé
+        par dichotomie dans le listing trié par nom et dans la vue triée. Au
+        delà de SMALL_CHANGES, tout est appliqué au modèle puis la vue est
+        retriée une seule fois : 10 000 fichiers extraits d'un coup ne coûtent
+        pas 10 000 insertions.
+        """
+        accept = self.entry_filter
+        query = self.search_entry.get().lower()
+        local = {name: entry for name, entry in changes.items() if os.sep not in name}
+        if len(local) < len(changes):
+            # Résultats d'une recherche récursive : hors du listing courant
+            self.replace_search_rows({name: entry for name, entry in changes.items()
+                                      if os.sep in name})
+        if not local:
+            return
+        self.cache.update(self.current_path, local)
+        small = len(local) <= SMALL_CHANGES
+        if small:
+            removed, added = [], []
+            for name, entry in local.items():
+                i = bisect_left(self.listing, name, key=NAME_KEY)
+                if i < len(self.listing) and self.listing[i].name == name:
+                    removed.append(self.listing.pop(i))
+                if entry is not None and (accept is None or accept(entry)):
+                    self.listing.insert(i, entry)
+                    added.append(entry)
+        else:
+            removed = [entry for entry in self.listing if entry.name in local]
+            added = sorted((entry for entry in local.values()
+                            if entry is not None and (accept is None or accept(entry))), key=NAME_KEY)
+            gone = {id(entry) for entry in removed}
+            self.listing[:] = [entry for entry in self.listing if id(entry) not in gone]
+            self.listing.extend(added)
+            self.listing.sort(key=NAME_KEY)  # Deux suites déjà triées : fusion linéaire
+        self.listing_total += len(added) - len(removed)
+        self.live_search = None
+        if self.showing_listing:
+            if query:
+                removed = [entry for entry in removed if query in entry.name.lower()]
+                added = [entry for entry in added if query in entry.name.lower()]
+            if small:
+                self.patch_rows(removed, added)
+            else:
+                gone = {id(entry) for entry in removed}
+                rows = [row for row in self.view.rows if id(row) not in gone]
+                body = rows[1:] + added
+                self.sort_order.sort(body)
+                self.view.reorder(rows[:1] + body)
+            if not query:
+                self.status_var.set(f"{self.listing_total} éléments")
+        dirs = [entry for entry in added if entry.is_dir]
+        if dirs:
+            self.dir_sizes.compute(self.current_path, dirs, self.size_cancel,
+                                   token=self.current_path)
+    
+    def patch_rows(self, removed, added):
+        """Retire et insère quelques lignes de la vue par dichotomie, sans retri"""
+        rows = self.view.rows
+        head = 1 if rows and rows[0] is PARENT_ENTRY else 0
+        for entry in removed:
+            index = self.sort_order.position(rows, entry, head)
+            if index >= len(rows) or rows[index] is not entry:
+                # Ordre périmé (taille d'un dossier arrivée après le tri) : recherche linéaire
+                index = next((i for i, row in enumerate(rows) if row is entry), None)
+            if index is not None:
+                self.view.remove_row(index)
+        for entry in added:
+            self.view.insert_row(self.sort_order.position(rows, entry, head), entry)
+    
+    def replace_search_rows(self, changes):
+        """Met à jour des lignes de résultats de recherche récursive : {nom relatif: Entry ou None}"""
+        if self.showing_listing:
+            return
+        changes = dict(changes)
+        rows = []
+        for row in self.view.rows:
+            if row.name in changes:
+                row = changes.pop(row.name)  # Première ligne de ce nom seulement
+                if row is None:
+                    continue
+            rows.append(row)
+        self.view.reorder(rows)
+    
+    def local_change(self, *names):
+        """Applique tout de suite le résultat d'une opération locale sur ces noms"""
+        self.apply_changes({name: stat_entry(self.current_path, name) for name in names})
+    
+    def on_load_error(self, error):
+        """Affiche l'échec d'un chargement dans la barre de statut"""
+        self.load_span = self.first_batch_span = None
+        if isinstance(error, PermissionError):
             self.status_var.set("Erreur: Accès refusé")
-        except Exception as e:
-            self.status_var.set(f"Erreur: {str(e)}")
+        else:
+            self.status_var.set(f"Erreur: {str(error)}")
+    
+    def sort_by(self, column, add=False):
+        """Trie la liste par la colonne cliquée (add : ajoute une clé secondaire)"""
+        self.sort_order.toggle(COLUMN_FIELDS[column], add)
+        self.update_headings()
+        self.resort_view()
+    
+    def on_heading_shift_click(self, event):
+        """Maj+clic sur un en-tête : tri multi-clés"""
+        if self.tree.identify_region(event.x, event.y) != "heading":
+            return None
+        self.sort_by(self.heading_at(event.x), add=True)
+        return "break"
+    
+    def heading_at(self, x):
+        """Identifiant de la colonne sous x ("#0", "Size"...), pas son rang affiché"""
+        column = self.tree.identify_column(x)
+        if column == "#0":
+            return column
+        displayed = self.tree["displaycolumns"]
+        if displayed in ("#all", ("#all",)):
+            displayed = self.tree["columns"]
+        return displayed[int(column[1:]) - 1]
+    
+    def update_headings(self):
+        """Affiche le sens de tri dans les en-têtes de colonnes"""
+        for column, title in HEADINGS.items():
+            self.tree.heading(column, text=title + self.sort_order.indicator(COLUMN_FIELDS[column]))
+    
+    def resort_view(self):
+        """Retrie le modèle de la liste en mémoire (ni stat, ni réinsertion)"""
+        rows = self.view.rows
+        head = [rows[0]] if rows and rows[0] is PARENT_ENTRY else []
+        body = rows[len(head):]
+        with instrument.span("tri") as span:
+            span.add(len(body))
+            self.sort_order.sort(body)
+        self.view.reorder(head + body)
+    
+    def clear_tree(self):
+        """Vide la liste et ajoute le dossier parent (..)"""
+        self.view.set_rows([PARENT_ENTRY])
+    
+    def insert_entries(self, entries):
+        """Ajoute un lot d'entrées reçu du thread de chargement au modèle"""
+        with instrument.span("insertion") as span:
+            span.add(len(entries))
+            self.listing.extend(entries)
+            query = self.search_entry.get()
+            if query:
+                # Recherche en direct pendant le chargement : n'afficher que les correspondances
+                self.live_search = None
+                entries = list(filter(make_name_matcher(query), entries))
+            self.view.extend(entries)
+        if self.first_batch_span is not None:
+            instrument.end(self.first_batch_span, len(entries))
+            self.first_batch_span = None
+    
+    @instrument.timed("formatage")
+    def render_entry(self, entry):
+        """Texte, colonnes, icône et tags d'une ligne (appelé pour les lignes visibles seulement)"""
+        if isinstance(entry, ContentMatch):
+            return (f"{entry.name}:{entry.line}",
+                    (format_size(entry.size), entry.snippet, format_mtime(entry.mtime)),
+                    self.type_icons.icon_for(entry.ext), ("file",))
+        if entry.is_dir:
+            size = "" if entry.size is None else format_size(entry.size)
+            return entry.name, (size, "Dossier", ""), self.folder_icon, ("dir",)
+        icon = self.type_icons.icon_for(entry.ext)
+        if entry.ext in THUMBNAIL_EXTENSIONS and self.archive is None:
+            icon = self.thumbnails.get(os.path.join(self.current_path, entry.name), entry) or icon
+        return (entry.name, (format_size(entry.size), entry.type_label, format_mtime(entry.mtime)),
+                icon, ("file",))
     
     def format_size(self, size):
         """Formate la taille en unités lisible"""
-        for unit in ['', 'K', 'M', 'G', 'T']:
-            if size < 1024:
-                return f"{size:.1f}{unit}B"
-            size /= 1024
-        return f"{size:.1f}PB"
+        return format_size(size)
     
     def on_double_click(self, event):
         """Gère le double-clic sur un élément"""
+        # Double-clic sur un en-tête : deux clics de tri, rien à ouvrir
+        if self.tree.identify_region(event.x, event.y) == "heading" or not self.tree.selection():
+            return
         item = self.tree.selection()[0]
-        name = self.tree.item(item, "text")
-        
+        entry = self.view.record(item)
+        name = self.tree.item(item, "text") if entry is None else entry.name
+        self.open_item(name, entry)
+    
+    def open_item(self, name, entry):
+        """Dossier ou archive : navigation ; fichier : ouverture avec l'application par défaut"""
         if name == "..":
             self.go_up()
-        else:
-            full_path = os.path.join(self.current_path, name)
-            if os.path.isdir(full_path):
+            return
+        full_path = os.path.join(self.current_path, name)
+        if self.archive is not None:
+            if entry is not None and entry.is_dir:
                 self.navigate_to(full_path)
             else:
-                self.open_file(full_path)
+                self.open_archive_member(full_path)
+        elif os.path.isdir(full_path) or archives.is_archive(full_path):
+            self.navigate_to(full_path)
+        else:
+            self.open_file(full_path)
+    
+    def open_archive_member(self, path):
+        """Extrait ce seul fichier de l'archive, en arrière-plan, puis l'ouvre"""
+        if self.extractor is None:
+            self.extractor = ThreadPoolExecutor(1, thread_name_prefix="extract")
+        self.status_var.set(f"Extraction de {os.path.basename(path)}...")
+        self.wait_extraction(self.extractor.submit(archives.extract_member, path))
+    
+    def wait_extraction(self, future):
+        """Attend la fin de l'extraction puis ouvre la copie extraite"""
+        if not future.done():
+            self.root.after(50, self.wait_extraction, future)
+            return
+        self.status_var.set("")
+        try:
+            target = future.result()
+        except OSError as e:
+            messagebox.showerror("Erreur", f"Impossible d'extraire le fichier: {e}")
+            return
+        self.open_file(target)
     
     def show_context_menu(self, event):
         """Affiche le menu contextuel"""
         item = self.tree.identify_row(event.y)
         if item:
-            self.tree.selection_set(item)
+            # Clic droit hors de la sélection : la remplacer par l'élément cliqué
+            if item not in self.tree.selection():
+                self.view.selected.clear()
+                self.tree.selection_set(item)
             self.context_menu.post(event.x_root, event.y_root)
     
     def open_selected(self):
         """Ouvre l'élément sélectionné"""
         selected = self.tree.selection()
         if selected:
-            item = self.tree.item(selected[0])
-            name = item["text"]
-            full_path = os.path.join(self.current_path, name)
-            
-            if name == "..":
-                self.go_up()
-            elif os.path.isdir(full_path):
-                self.navigate_to(full_path)
-            else:
-                self.open_file(full_path)
+            entry = self.view.record(selected[0])
+            name = self.tree.item(selected[0], "text") if entry is None else entry.name
+            self.open_item(name, entry)
     
     def open_file(self, path):
-        """Ouvre un fichier avec l'application par défaut"""
+        """Ouvre un fichier avec l'application par défaut, sans attendre qu'elle se termine"""
         try:
-            os.startfile(path)  # Windows
-        except:
-            try:
-                os.system(f'xdg-open "{path}"')  # Linux
-            except:
-                try:
-                    os.system(f'open "{path}"')  # macOS
-                except:
-                    messagebox.showerror("Erreur", "Impossible d'ouvrir le fichier")
+            if sys.platform == "win32":
+                os.startfile(path)
+            else:
+                opener = "open" if sys.platform == "darwin" else "xdg-open"
+                subprocess.Popen([opener, path], stdin=subprocess.DEVNULL,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                 start_new_session=True)
+        except OSError as e:
+            messagebox.showerror("Erreur", f"Impossible d'ouvrir le fichier: {e}")
+    
+    def on_selection_changed(self, event=None):
+        """Sélection modifiée : aperçu mis à jour après une courte pause"""
+        if self.preview_after_id is not None:
+            self.root.after_cancel(self.preview_after_id)
+        self.preview_after_id = self.root.after(PREVIEW_DELAY_MS, self.update_preview)
+    
+    def update_preview(self):
+        """Aperçu du fichier sélectionné (un seul fichier, pas de dossier)"""
+        self.preview_after_id = None
+        rows = self.view.selected_rows()
+        entry = rows[0] if len(rows) == 1 and not rows[0].is_dir else None
+        if entry is None or self.archive is not None:
+            self.previews.cancel()
+            self.preview_path = self.preview_page = None
+            self.preview_info.set("" if entry is None else "Double-clic pour extraire et ouvrir")
+            self.set_preview_text("")
+            return
+        path = os.path.join(self.current_path, entry.name)
+        if path != self.preview_path:
+            self.preview_path = path
+            self.request_preview(path)
+    
+    def on_preview_mode(self):
+        """Changement de mode (auto, texte, hexa) : réaffiche depuis le début"""
+        self.preview_page = None  # Mode « auto » : nouvelle détection
+        if self.preview_path is not None:
+            self.request_preview(self.preview_path)
+    
+    def request_preview(self, path, offset=0, back=0, align=False):
+        """Demande une page d'aperçu ; affichée tout de suite si elle est en cache"""
+        mode = self.preview_mode.get()
+        kind = None if mode == "auto" else mode
+        if self.preview_page is not None and self.preview_page.path == path:
+            kind = kind or self.preview_page.kind  # Défilement : garder le mode détecté
+        page = self.previews.request(path, kind, offset, back, align)
+        if page is not None:
+            self.show_preview(page)
+        elif not self.preview_polling:
+            self.preview_polling = True
+            self.root.after(PREVIEW_POLL_MS, self.poll_preview)
+    
+    def poll_preview(self):
+        """Récupère la page calculée par le thread d'aperçu"""
+        page = self.previews.poll()
+        if page is not None:
+            self.show_preview(page)
+        if self.previews.busy:
+            self.root.after(PREVIEW_POLL_MS, self.poll_preview)
+        else:
+            self.preview_polling = False
+    
+    def show_preview(self, page):
+        """Affiche une page d'aperçu si elle concerne toujours la sélection"""
+        if page.path != self.preview_path:
+            return
+        self.preview_page = page
+        if page.error is not None:
+            self.preview_info.set(page.error)
+            self.set_preview_text("")
+        elif page.kind == IMAGE:
+            self.show_preview_image(page)
+        else:
+            self.preview_info.set(f"{format_size(page.size)} — octets {page.offset}-{page.end}")
+            self.set_preview_text(page.text)
+            if page.size:
+                self.preview_scroll.set(page.offset / page.size, page.end / page.size)
+    
+    def set_preview_text(self, text):
+        """Remplace le texte de l'aperçu (widget en lecture seule)"""
+        self.preview_image.pack_forget()
+        if not self.preview_text.winfo_ismapped():
+            self.preview_scroll.pack(side="right", fill="y")
+            self.preview_text.pack(side="left", fill="both", expand=True)
+        self.preview_text.configure(state="normal")
+        self.preview_text.delete("1.0", "end")
+        self.preview_text.insert("1.0", text)
+        self.preview_text.configure(state="disabled")
+    
+    def show_preview_image(self, page):
+        """Affiche l'image réduite par le thread d'aperçu (ou lue par Tk sans PIL)"""
+        try:
+            if page.image is not None:
+                photo = tk.PhotoImage(data=base64.b64encode(page.image))
+            else:
+                photo = tk.PhotoImage(file=page.path)
+                factor = -(-max(photo.width(), photo.height()) // IMAGE_SIZE)
+                if factor > 1:
+                    photo = photo.subsample(factor)
+        except tk.TclError as e:
+            self.preview_info.set(f"Image illisible: {e}")
+            return
+        self.preview_photo = photo
+        self.preview_info.set(f"{format_size(page.size)} — {photo.width()}×{photo.height()} (réduite)")
+        self.preview_text.pack_forget()
+        self.preview_scroll.pack_forget()
+        self.preview_image.configure(image=photo)
+        self.preview_image.pack(fill="both", expand=True)
+    
+    def on_preview_scroll(self, *args):
+        """Barre de défilement de l'aperçu : position en octets, pas en lignes"""
+        page = self.preview_page
+        if page is None or page.kind == IMAGE or not page.size:
+            return
+        if args[0] == "moveto":
+            offset = int(max(0.0, min(1.0, float(args[1]))) * page.size)
+            self.request_preview(page.path, offset, align=True)
+        else:
+            step = int(args[1])
+            self.scroll_preview(step * (PREVIEW_LINES - 2) if args[2] == "pages" else step)
+    
+    def scroll_preview(self, lines):
+        """Fait défiler l'aperçu de lines lignes (négatif : vers le haut)"""
+        page = self.preview_page
+        if page is None or page.kind == IMAGE or page.error is not None:
+            return "break"
+        if lines > 0:
+            offset = page.starts[lines] if lines < len(page.starts) else page.end
+            if offset < page.size:
+                self.request_preview(page.path, offset)
+        elif page.offset > 0:
+            self.request_preview(page.path, page.offset, back=-lines)
+        return "break"
     
     def create_folder(self):
         """Crée un nouveau dossier"""
+        if self.in_archive():
+            return
+        from tkinter import simpledialog
         name = simpledialog.askstring("Nouveau dossier", "Nom du dossier:")
         if name:
             try:
                 os.mkdir(os.path.join(self.current_path, name))
-                self.load_content()
+                self.local_change(name)
             except Exception as e:
                 messagebox.showerror("Erreur", f"Impossible de créer le dossier: {str(e)}")
     
     def rename_item(self):
         """Renomme l'élément sélectionné"""
         selected = self.tree.selection()
-        if selected:
-            item = self.tree.item(selected[0])
-            old_name = item["text"]
+        if selected and not self.in_archive():
+            entry = self.view.record(selected[0])
+            old_name = self.tree.item(selected[0], "text") if entry is None else entry.name
+            if old_name == "..":
+                return
+            from tkinter import simpledialog
             new_name = simpledialog.askstring("Renommer", "Nouveau nom:", initialvalue=old_name)
             
             if new_name and new_name != old_name:
@@ -445,54 +1255,145 @@ class FileExplorer:
                         os.path.join(self.current_path, old_name),
                         os.path.join(self.current_path, new_name)
                     )
-                    self.load_content()
+                    self.local_change(old_name, new_name)
                 except Exception as e:
                     messagebox.showerror("Erreur", f"Impossible de renommer: {str(e)}")
     
     def delete_item(self):
-        """Supprime l'élément sélectionné"""
-        selected = self.tree.selection()
-        if selected:
-            item = self.tree.item(selected[0])
-            name = item["text"]
-            
-            if messagebox.askyesno("Confirmer", f"Supprimer {name} ?"):
-                try:
-                    path = os.path.join(self.current_path, name)
-                    if os.path.isdir(path):
-                        os.rmdir(path)
-                    else:
-                        os.remove(path)
-                    self.load_content()
-                except Exception as e:
-                    messagebox.showerror("Erreur", f"Impossible de supprimer: {str(e)}")
+        """Supprime les éléments sélectionnés (dossiers compris, récursivement)"""
+        paths = self.selected_paths()
+        if paths and not self.in_archive():
+            if len(paths) == 1:
+                question = f"Supprimer {os.path.basename(paths[0])} ?"
+            else:
+                question = f"Supprimer {len(paths)} éléments ?"
+            if messagebox.askyesno("Confirmer", question):
+                self.start_job(FileJob(DELETE, paths))
+    
+    def selected_paths(self):
+        """Chemins des éléments sélectionnés, y compris hors de l'écran"""
+        # Plusieurs lignes d'un même fichier (recherche dans le contenu) : un seul chemin
+        return list(dict.fromkeys(os.path.join(self.current_path, entry.name)
+                                  for entry in self.view.selected_rows() if entry is not PARENT_ENTRY))
+    
+    def copy_selection(self, kind):
+        """Copier / Couper : mémorise la sélection pour Coller"""
+        paths = self.selected_paths()
+        if paths and not self.in_archive():
+            self.clipboard = (kind, paths)
+            verb = "copié(s)" if kind == COPY else "coupé(s)"
+            self.status_var.set(f"{len(paths)} élément(s) {verb}")
+    
+    def paste(self):
+        """Colle le presse-papiers dans le dossier courant"""
+        if self.clipboard and not self.in_archive():
+            kind, paths = self.clipboard
+            if kind == MOVE:
+                self.clipboard = None
+            self.start_job(FileJob(kind, paths, self.current_path))
+    
+    def start_job(self, job):
+        """Envoie un travail à la file des opérations"""
+        self.last_job = self.file_ops.submit(job)
+        self.status_var.set(f"{job.label}: en attente...")
+    
+    def cancel_job(self):
+        """Annule l'opération en cours, sinon la dernière mise en file (elle pourra être reprise)"""
+        job = self.file_ops.current
+        if job is None and self.last_job is not None and self.last_job.state == "pending":
+            job = self.last_job
+        if job is not None:
+            job.cancel()
+    
+    def resume_job(self):
+        """Reprend la dernière opération annulée là où elle s'était arrêtée"""
+        job = self.cancelled_job
+        if job is not None and job.state == "cancelled":
+            self.cancelled_job = None
+            job.resume()
+            self.start_job(job)
+    
+    def show_job_progress(self):
+        """Progression, débit et temps restant de l'opération en cours"""
+        job = self.file_ops.current
+        if job is not None and job.state == "running":
+            fraction, rate, remaining = job.progress()
+            text = f"{job.label}: {fraction:.0%} ({job.done_items}/{job.total_items})"
+            if job.total_bytes:
+                text += f" — {format_size(rate)}/s"
+            if remaining is not None:
+                text += f" — reste {format_duration(remaining)}"
+            self.status_var.set(text)
+        while True:
+            try:
+                job = self.file_ops.finished.get_nowait()
+            except queue.Empty:
+                break
+            if job.state == "done":
+                self.status_var.set(f"{job.label} terminée")
+            elif job.state == "cancelled":
+                self.cancelled_job = job
+                self.status_var.set(f"{job.label} annulée — « Reprendre » pour continuer")
+            else:
+                messagebox.showerror("Erreur", f"{job.label} impossible: {job.error}")
+            if not self.showing_listing:
+                self.prune_results()
+            elif self.current_path in job.touched:
+                self.refresh()
     
     def show_properties(self):
         """Affiche les propriétés de l'élément sélectionné"""
         selected = self.tree.selection()
         if selected:
-            item = self.tree.item(selected[0])
-            name = item["text"]
+            entry = self.view.record(selected[0])
+            name = self.tree.item(selected[0], "text") if entry is None else entry.name
             path = os.path.join(self.current_path, name)
-            
-            try:
-                stat = os.stat(path)
-                size = self.format_size(stat.st_size)
-                mtime = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-                ctime = datetime.fromtimestamp(stat.st_ctime).strftime("%Y-%m-%d %H:%M:%S")
-                
+            if self.archive is not None and entry is not None:
+                # Membre d'archive : propriétés tirées de l'index
                 messagebox.showinfo("Propriétés",
-                    f"Nom: {name}\n"
+                    f"Nom: {os.path.basename(name)}\n"
                     f"Chemin: {path}\n"
-                    f"Taille: {size}\n"
-                    f"Type: {'Dossier' if os.path.isdir(path) else 'Fichier'}\n"
-                    f"Créé le: {ctime}\n"
-                    f"Modifié le: {mtime}")
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Impossible d'obtenir les propriétés: {str(e)}")
+                    f"Taille: {format_size(entry.size or 0)}\n"
+                    f"Type: {entry.type_label} (archive {os.path.basename(self.archive[0])})\n"
+                    f"Modifié le: {format_mtime(entry.mtime)}")
+            elif entry is not None and entry.is_dir and entry.size is None:
+                # Taille récursive calculée en arrière-plan (st_size d'un dossier ne veut rien dire)
+                self.status_var.set(f"Calcul de la taille de {name}...")
+                self.wait_properties(path, self.dir_sizes.submit(path))
+            else:
+                self.show_properties_dialog(path, None if entry is None else entry.size)
+    
+    def wait_properties(self, path, future):
+        """Attend la fin du calcul de taille d'un dossier puis affiche ses propriétés"""
+        if not future.done():
+            self.root.after(100, self.wait_properties, path, future)
+            return
+        self.status_var.set("")
+        size = future.result()
+        self.show_properties_dialog(path, size if size is not None else 0)
+    
+    def show_properties_dialog(self, path, size):
+        """Boîte de dialogue des propriétés"""
+        try:
+            props = core.properties(path, size)
+        except OSError as e:
+            messagebox.showerror("Erreur", f"Impossible d'obtenir les propriétés: {str(e)}")
+            return
+        messagebox.showinfo("Propriétés",
+            f"Nom: {props['name']}\n"
+            f"Chemin: {props['path']}\n"
+            f"Taille: {format_size(props['size'])}\n"
+            f"Type: {props['type']}\n"
+            f"Créé le: {props['created']}\n"
+            f"Modifié le: {props['modified']}")
 
 if __name__ == "__main__":
-    from tkinter import simpledialog
+    try:
+        locale.setlocale(locale.LC_COLLATE, "")  # Tri des noms selon la langue de l'utilisateur
+    except locale.Error:
+        pass
     root = tk.Tk()
     app = FileExplorer(root)
+    if os.environ.get(STARTUP_BENCH_ENV):
+        app.probe_startup()
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""Archives : lister sans extraire, index tar réutilisé, extraction d'un seul membre
+
+Usage : python benchmarks/bench_archives.py [nombre_de_fichiers]
+"""
+import os
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from explorateur import archives
+
+
+def make_archives(tmp, count):
+    source = os.path.join(tmp, "source")
+    for i in range(count):
+        directory = os.path.join(source, f"d{i % 50:02d}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"f{i:06d}.txt"), "w") as f:
+            f.write(f"fichier {i}\n" * 200)
+    zip_path = os.path.join(tmp, "donnees.zip")
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for root, _, files in os.walk(source):
+            for name in files:
+                path = os.path.join(root, name)
+                zf.write(path, os.path.relpath(path, source))
+    tar_path = os.path.join(tmp, "donnees.tar.gz")
+    with tarfile.open(tar_path, "w:gz") as tf:
+        tf.add(source, arcname=".")
+    return zip_path, tar_path
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<38} {(time.perf_counter() - start) * 1000:9.2f} ms")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["XDG_CACHE_HOME"] = os.path.join(tmp, "cache")
+        zip_path, tar_path = make_archives(tmp, count)
+        last = f"d{(count - 1) % 50:02d}/f{count - 1:06d}.txt"
+
+        def extract_all():
+            with zipfile.ZipFile(zip_path) as zf:
+                zf.extractall(os.path.join(tmp, "tout"))
+
+        print(f"{count} fichiers")
+        timed("zip : extraction complète", extract_all)
+        timed("zip : liste (répertoire central)", lambda: archives.list_archive(zip_path))
+        timed("zip : un seul membre", lambda: archives.extract_member(os.path.join(zip_path, last)))
+        timed("tar.gz : première visite (indexation)", lambda: archives.list_archive(tar_path))
+        archives._indexes.clear()  # Nouvelle session : seul l'index sur disque reste
+        timed("tar.gz : visite suivante (index)", lambda: archives.list_archive(tar_path))
+        timed("tar.gz : dernier membre", lambda: archives.extract_member(os.path.join(tar_path, last)))
+        archives.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Cœur sans affichage : débit et mémoire de core.walk sérialisé en NDJSON
+
+Compare la diffusion au fil de l'eau à la construction préalable d'une
+liste (ce que faisait l'interface), pic mémoire mesuré par tracemalloc.
+
+Usage : python benchmarks/bench_cli.py [nombre_de_fichiers]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from explorateur import core
+
+
+def make_tree(root, count):
+    for i in range(count):
+        sub = os.path.join(root, f"d{i // 1000}")
+        if i % 1000 == 0:
+            os.makedirs(sub)
+        open(os.path.join(sub, f"fichier_{i}.txt"), "w").close()
+
+
+def measure(label, run):
+    start = time.perf_counter()
+    count = run()
+    elapsed = time.perf_counter() - start
+    # Deuxième passage pour la mémoire : tracemalloc ralentit trop pour chronométrer
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<18} {count:8d} lignes  {elapsed:6.2f} s  {count / elapsed:9.0f} /s  "
+          f"pic {peak / 1e6:7.1f} Mo")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as out:
+        make_tree(tmp, count)
+
+        def streamed():
+            n = 0
+            for directory, entry in core.walk(tmp):
+                out.write(json.dumps(core.entry_record(entry, directory)) + "\n")
+                n += 1
+            return n
+
+        def materialized():
+            records = [core.entry_record(entry, directory) for directory, entry in core.walk(tmp)]
+            for record in records:
+                out.write(json.dumps(record) + "\n")
+            return len(records)
+
+        measure("liste complète", materialized)
+        measure("au fil de l'eau", streamed)
+
+
+if __name__ == "__main__":
+    main()
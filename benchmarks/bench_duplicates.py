@@ -0,0 +1,73 @@
+"""Recherche de doublons : hachage complet naïf vs tri par taille + empreinte partielle
+
+Usage : python benchmarks/bench_duplicates.py [nombre_de_fichiers]
+"""
+import hashlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from explorateur.duplicates import DuplicateFinder
+
+
+def make_tree(root, count):
+    """Fichiers de tailles variées ; 10 % de copies, beaucoup de tailles communes"""
+    rng = random.Random(0)
+    made = []
+    for i in range(count):
+        sub = os.path.join(root, f"d{i // 200}")
+        os.makedirs(sub, exist_ok=True)
+        path = os.path.join(sub, f"f{i}.bin")
+        if made and rng.random() < 0.1:
+            shutil.copyfile(rng.choice(made), path)
+        else:
+            size = rng.choice((4096, 65536, 1 << 20)) if rng.random() < 0.5 else rng.randint(1, 1 << 20)
+            with open(path, "wb") as f:
+                f.write(os.urandom(size))
+        made.append(path)
+
+
+def naive(root):
+    """Ancienne approche d'un outil externe : tout hacher"""
+    groups = defaultdict(list)
+    hashed = 0
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            hashed += len(data)
+            groups[hashlib.sha256(data).digest()].append(path)
+    return sum(1 for g in groups.values() if len(g) > 1), hashed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "arbre")
+        make_tree(tree, count)
+
+        start = time.perf_counter()
+        groups, hashed = naive(tree)
+        elapsed = time.perf_counter() - start
+        print(f"tout hacher           : {groups:5d} groupes  {elapsed:6.2f} s  {hashed / 1e6:8.1f} Mo lus")
+
+        db = os.path.join(tmp, "hashes.sqlite")
+        for label in ("par étapes (froid)", "par étapes (cache)"):
+            finder = DuplicateFinder(db_path=db)
+            start = time.perf_counter()
+            list(finder.run(tree, threading.Event()))
+            elapsed = time.perf_counter() - start
+            print(f"{label:<22}: {finder.groups:5d} groupes  {elapsed:6.2f} s  "
+                  f"{finder.bytes_hashed / 1e6:8.1f} Mo lus")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Débit de copie : moteur explorateur.fileops vs shutil.copytree
+
+Deux cas extrêmes : beaucoup de petits fichiers, puis quelques gros fichiers.
+
+Usage : python benchmarks/bench_fileops.py [nombre_petits] [taille_gros_Mo]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from explorateur.fileops import COPY, FileJob
+
+
+def make_tree(root, count, size):
+    os.makedirs(root)
+    data = os.urandom(size)
+    for i in range(count):
+        sub = os.path.join(root, f"d{i // 500}")
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"f{i}.bin"), "wb") as f:
+            f.write(data)
+
+
+def bench(label, src, tmp, total):
+    dest = os.path.join(tmp, "shutil")
+    start = time.perf_counter()
+    shutil.copytree(src, dest)
+    t_shutil = time.perf_counter() - start
+
+    os.makedirs(os.path.join(tmp, "engine"))
+    job = FileJob(COPY, [src], os.path.join(tmp, "engine"))
+    start = time.perf_counter()
+    job.run()
+    t_engine = time.perf_counter() - start
+    assert job.state == "done", job.error
+
+    mb = total / 1e6
+    print(f"{label:<28} shutil {t_shutil:6.2f} s ({mb / t_shutil:7.1f} Mo/s)"
+          f"   moteur {t_engine:6.2f} s ({mb / t_engine:7.1f} Mo/s)")
+    shutil.rmtree(dest)
+    shutil.rmtree(os.path.join(tmp, "engine"))
+
+
+def main():
+    small = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    big_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "petits")
+        make_tree(src, small, 4096)
+        bench(f"{small} fichiers de 4 Ko", src, tmp, small * 4096)
+        shutil.rmtree(src)
+
+        src = os.path.join(tmp, "gros")
+        make_tree(src, 2, big_mb * 1024 * 1024)
+        bench(f"2 fichiers de {big_mb} Mo", src, tmp, 2 * big_mb * 1024 * 1024)
+
+
+if __name__ == "__main__":
+    main()
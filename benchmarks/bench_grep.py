@@ -0,0 +1,80 @@
+"""Débit de la recherche dans le contenu : lecture ligne à ligne vs mmap + pool
+
+Usage : python benchmarks/bench_grep.py [nombre_de_fichiers] [taille_Ko]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from explorateur.grep import ContentSearch, compile_query
+
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+         "tempor incididunt ut labore et dolore magna aliqua").split()
+
+
+def make_tree(root, count, size_kb):
+    rng = random.Random(0)
+    for i in range(count):
+        sub = os.path.join(root, f"d{i // 200}")
+        os.makedirs(sub, exist_ok=True)
+        lines = []
+        total = 0
+        while total < size_kb * 1024:
+            line = " ".join(rng.choice(WORDS) for _ in range(12))
+            if rng.random() < 0.001:
+                line += " aiguille"
+            lines.append(line)
+            total += len(line) + 1
+        with open(os.path.join(sub, f"f{i}.txt"), "w") as f:
+            f.write("\n".join(lines))
+        if i % 50 == 0:
+            with open(os.path.join(sub, f"b{i}.bin"), "wb") as f:
+                f.write(os.urandom(size_kb * 1024))
+
+
+def naive(root, needle):
+    """Ancienne approche : chaque fichier décodé et lu ligne à ligne"""
+    found = scanned = 0
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        if needle in line.lower():
+                            found += 1
+            except (UnicodeDecodeError, OSError):
+                pass
+            scanned += os.path.getsize(path)
+    return found, scanned
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp, count, size_kb)
+
+        start = time.perf_counter()
+        found, scanned = naive(tmp, "aiguille")
+        elapsed = time.perf_counter() - start
+        print(f"ligne à ligne  : {found:6d} lignes  {elapsed:6.2f} s  {scanned / elapsed / 1e6:8.1f} Mo/s")
+
+        searcher = ContentSearch()
+        # Démarrage du pool hors mesure, comme après la première recherche
+        list(searcher.run(tmp, compile_query("inexistant"), threading.Event()))
+        start = time.perf_counter()
+        found = sum(1 for _ in searcher.run(tmp, compile_query("aiguille"), threading.Event()))
+        elapsed = time.perf_counter() - start
+        print(f"mmap + pool ({searcher.workers}): {found:6d} lignes  {elapsed:6.2f} s  "
+              f"{searcher.bytes_scanned / elapsed / 1e6:8.1f} Mo/s")
+        searcher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Index persistant : scan complet à froid, rafraîchissement incrémental, requête
+
+Usage : python benchmarks/bench_index.py [nombre_de_fichiers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from explorateur.index import MetadataIndex
+
+FILES_PER_DIR = 100
+DIRS_PER_LEVEL = 10
+
+
+def make_tree(root, n_files):
+    """Arborescence à deux niveaux de FILES_PER_DIR fichiers par dossier"""
+    dirs = []
+    n_dirs = max(1, n_files // FILES_PER_DIR)
+    for i in range(n_dirs):
+        path = os.path.join(root, f"niveau_{i // DIRS_PER_LEVEL:04d}", f"dossier_{i:05d}")
+        os.makedirs(path)
+        dirs.append(path)
+        for j in range(FILES_PER_DIR):
+            open(os.path.join(path, f"rapport_{i}_{j}.txt"), "w").close()
+    return dirs
+
+
+def walk_search(root, query):
+    """Référence sans index : parcours complet du disque à chaque requête"""
+    hits = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        hits += sum(query in name.lower() for name in dirnames + filenames)
+    return hits
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"{label:<38} {(time.perf_counter() - start) * 1000:10.1f} ms   {result}")
+    return result
+
+
+def main():
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "arbre")
+        dirs = make_tree(root, n_files)
+        db_path = os.path.join(tmp, "index.sqlite")
+        print(f"{n_files} fichiers dans {len(dirs)} dossiers")
+        with MetadataIndex(db_path) as index:
+            timed("scan complet à froid", index.refresh, root)
+            timed("rafraîchissement sans changement", index.refresh, root)
+            for path in dirs[::50]:
+                open(os.path.join(path, "nouveau.txt"), "w").close()
+            timed(f"rafraîchissement ({len(dirs[::50])} dossiers modifiés)", index.refresh, root)
+            timed("requête indexée « 42_7 »", lambda: sum(1 for _ in index.search(root, "42_7")))
+            timed("requête indexée « nouveau »", lambda: sum(1 for _ in index.search(root, "nouveau")))
+        timed("parcours os.walk « 42_7 » (sans index)", walk_search, root, "42_7")
+
+
+if __name__ == "__main__":
+    main()
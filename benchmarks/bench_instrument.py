@@ -0,0 +1,70 @@
+"""Coût de l'instrumentation : désactivée, elle doit rester négligeable
+
+Mesure le coût par appel de span()/timed() (désactivés puis activés) et
+le listing d'un dossier avec et sans comptage des appels système.
+
+Usage : python benchmarks/bench_instrument.py [nombre_de_fichiers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from explorateur import instrument
+from explorateur.core import list_directory
+
+CALLS = 200_000
+
+
+@instrument.timed("fonction")
+def decorated():
+    pass
+
+
+def plain():
+    pass
+
+
+def per_call(func):
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        func()
+    return (time.perf_counter() - start) / CALLS * 1e9
+
+
+def spans():
+    with instrument.span("phase"):
+        pass
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    base = per_call(plain)
+    print(f"appel de fonction nu      : {base:7.1f} ns")
+    for state in ("désactivé", "activé"):
+        if state == "activé":
+            instrument.recorder.enable()
+        print(f"span() {state:<10}         : {per_call(spans):7.1f} ns")
+        print(f"@timed {state:<10}         : {per_call(decorated):7.1f} ns")
+    instrument.recorder.disable()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(count):
+            open(os.path.join(tmp, f"f{i}.txt"), "w").close()
+        for state in ("désactivé", "activé"):
+            if state == "activé":
+                instrument.recorder.enable()
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                list(list_directory(tmp))
+                best = min(best, time.perf_counter() - start)
+            print(f"listing de {count} fichiers, {state:<10}: {best * 1000:7.1f} ms")
+        print("  " + "\n  ".join(instrument.summary()))
+        instrument.recorder.disable()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Compte les appels stat/listdir par entrée : ancien listing vs moteur os.scandir
+
+Usage : python benchmarks/bench_listing.py [nombre_de_fichiers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from explorateur import core
+from explorateur.filters import EntryFilter
+
+
+_real_scandir = os.scandir
+
+
+class _Counter:
+    def __init__(self):
+        self.calls = 0
+
+
+def _counting_stat(counter, real_stat):
+    def stat(*args, **kwargs):
+        counter.calls += 1
+        return real_stat(*args, **kwargs)
+    return stat
+
+
+class _CountingDirEntry:
+    """Enveloppe un os.DirEntry pour compter ses appels stat()"""
+
+    def __init__(self, dirent, counter):
+        self._dirent = dirent
+        self._counter = counter
+        self.name = dirent.name
+        self.path = dirent.path
+
+    def is_dir(self, **kwargs):
+        return self._dirent.is_dir(**kwargs)
+
+    def stat(self, **kwargs):
+        self._counter.calls += 1
+        return self._dirent.stat(**kwargs)
+
+
+class _CountingScandir:
+    def __init__(self, path, counter):
+        counter.calls += 1  # opendir + getdents
+        self._it = _real_scandir(path)
+        self._counter = counter
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._it.close()
+
+    def __iter__(self):
+        for dirent in self._it:
+            yield _CountingDirEntry(dirent, self._counter)
+
+
+def legacy_listing(path, filter_ext):
+    """Reproduit la boucle historique de load_content (os.listdir + os.path.*)"""
+    rows = []
+    for item in sorted(os.listdir(path)):
+        full_path = os.path.join(path, item)
+        if filter_ext != "*":
+            if os.path.isfile(full_path):
+                ext = os.path.splitext(item)[1].lower()
+                if ext not in filter_ext.split(";"):
+                    continue
+        if os.path.isdir(full_path):
+            rows.append((item, None, None))
+        else:
+            rows.append((item, os.path.getsize(full_path), os.path.getmtime(full_path)))
+    rows.append(len(os.listdir(path)))
+    return rows
+
+
+def scandir_listing(path, filter_ext):
+    entries = sorted(core.list_directory(path), key=lambda e: e.name)
+    accept = EntryFilter.parse(filter_ext)
+    return [e for e in entries if accept is None or accept(e)], len(entries)
+
+
+def make_tree(root, n_files):
+    n_dirs = max(1, n_files // 10)
+    for i in range(n_dirs):
+        os.mkdir(os.path.join(root, f"dossier_{i:06d}"))
+    for i in range(n_files):
+        ext = (".txt", ".jpg", ".pdf", ".py")[i % 4]
+        with open(os.path.join(root, f"fichier_{i:06d}{ext}"), "wb") as f:
+            f.write(b"x" * (i % 512))
+    return n_files + n_dirs
+
+
+def measure(label, func, path, filter_ext, n_entries):
+    counter = _Counter()
+    real_stat, real_listdir = os.stat, os.listdir
+    os.stat = _counting_stat(counter, real_stat)
+    os.listdir = _counting_stat(counter, real_listdir)
+    try:
+        # listing utilise le module os : on remplace scandir le temps de la mesure
+        os.scandir = lambda p: _CountingScandir(p, counter)
+        start = time.perf_counter()
+        func(path, filter_ext)
+        elapsed = time.perf_counter() - start
+    finally:
+        os.stat, os.listdir, os.scandir = real_stat, real_listdir, _real_scandir
+    print(f"{label:<10} filtre={filter_ext:<16} "
+          f"{counter.calls:>8} appels  {counter.calls / n_entries:5.2f}/entrée  "
+          f"{elapsed * 1000:8.1f} ms")
+
+
+def main():
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as root:
+        n_entries = make_tree(root, n_files)
+        print(f"{n_entries} entrées dans {root}")
+        for filter_ext in ("*", ".jpg;.png;.gif"):
+            measure("os.path", legacy_listing, root, filter_ext, n_entries)
+            measure("scandir", scandir_listing, root, filter_ext, n_entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Débit (lignes/s) de la chaîne de listing sur des dossiers synthétiques
+
+Étapes mesurées : création des Entry, filtre compilé, clés de tri et tri,
+puis formatage des colonnes, soit paresseux (un écran de lignes) soit
+complet (toutes les lignes, comme l'ancienne boucle load_content).
+
+Usage : python benchmarks/bench_pipeline.py [--disk] [tailles...]
+  --disk : crée réellement les fichiers et passe par list_directory
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from explorateur.filters import EntryFilter
+from explorateur.formatting import format_mtime, format_size
+from explorateur.core import list_directory
+from explorateur.listing import Entry
+from explorateur.sorting import SortOrder, natural_key
+
+SIZES = (10_000, 100_000, 1_000_000)
+EXTENSIONS = (".txt", ".jpg", ".png", ".pdf", ".py", ".gif", ".docx", "")
+SCREEN_ROWS = 40
+
+
+def synthetic_entries(n):
+    """Entrées réalistes : tailles log-normales, fichiers écrits par rafales"""
+    rng = random.Random(n)
+    now = time.time()
+    entries = []
+    for i in range(n):
+        if i % 20 == 0:
+            entries.append(Entry(f"dossier {i}", True))
+        else:
+            name = f"fichier_{rng.randrange(n)}_{i}{EXTENSIONS[i % len(EXTENSIONS)]}"
+            size = int(rng.lognormvariate(8, 3))
+            mtime = now - (i // 50) * 3600 - rng.random() * 30
+            entries.append(Entry(name, False, size, mtime))
+    return entries
+
+
+def disk_entries(root, n):
+    for i in range(n):
+        open(os.path.join(root, f"fichier_{i}{EXTENSIONS[i % len(EXTENSIONS)]}"), "w").close()
+    return list(list_directory(root))
+
+
+def legacy_format(entry):
+    mtime = datetime.fromtimestamp(entry.mtime).strftime("%Y-%m-%d %H:%M")
+    return format_size.__wrapped__(entry.size), entry.type_label, mtime
+
+
+def lazy_format(entry):
+    return format_size(entry.size), entry.type_label, format_mtime(entry.mtime)
+
+
+def run(n, disk):
+    timings = []
+
+    def step(label, func):
+        start = time.perf_counter()
+        result = func()
+        timings.append((label, time.perf_counter() - start))
+        return result
+
+    if disk:
+        with tempfile.TemporaryDirectory() as root:
+            entries = step("list_directory", lambda: disk_entries(root, n))
+    else:
+        entries = step("création des Entry", lambda: synthetic_entries(n))
+    accept = EntryFilter.parse(".jpg;.png;.gif") & EntryFilter(min_size=1024)
+    kept = step("filtre compilé", lambda: [e for e in entries if accept(e)])
+    step("clés de tri naturelles", lambda: [natural_key(e) for e in entries])
+    order = SortOrder()
+    step("tri (clés précalculées)", lambda: order.sort(entries))
+    files = [e for e in entries if not e.is_dir]
+    step("formatage paresseux (1 écran)", lambda: [lazy_format(e) for e in files[:SCREEN_ROWS]])
+    step("formatage complet mémorisé", lambda: [lazy_format(e) for e in files])
+    step("formatage complet historique", lambda: [legacy_format(e) for e in files])
+
+    print(f"\n{n} entrées ({len(kept)} après filtre)")
+    for label, seconds in timings:
+        rate = n / seconds if seconds else float("inf")
+        print(f"  {label:<32} {seconds * 1000:10.1f} ms  {rate:14,.0f} lignes/s")
+
+
+def main():
+    args = sys.argv[1:]
+    disk = "--disk" in args
+    sizes = [int(a) for a in args if a != "--disk"] or SIZES
+    for n in sizes:
+        run(n, disk)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Aperçu d'un gros journal : lecture complète vs pages lues par mmap
+
+Usage : python benchmarks/bench_preview.py [taille_Mo]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from explorateur.preview import hex_page, text_page
+
+
+def make_log(path, size_mb):
+    line = b"2025-03-31 15:47:55 INFO requete traitee en 12 ms par le serveur 42\n"
+    block = line * (1024 * 1024 // len(line))
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    func()
+    print(f"{label:<34} {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "serveur.log")
+        make_log(path, size_mb)
+        size = os.path.getsize(path)
+
+        def read_all():
+            with open(path, encoding="utf-8") as f:
+                f.read().splitlines()[:60]
+
+        timed(f"lecture complète ({size_mb} Mo)", read_all)
+        timed("première page (mmap)", lambda: text_page(path, 0))
+        timed("milieu du fichier (barre)", lambda: text_page(path, size // 2, align=True))
+        timed("dernière page (barre)", lambda: text_page(path, size, align=True))
+        timed("page précédente (60 lignes)", lambda: text_page(path, size // 2, back=60))
+        timed("page hexadécimale (pread)", lambda: hex_page(path, size // 3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Mesure du démarrage à froid : temps jusqu'à la fenêtre et jusqu'aux premières lignes
+
+Lance l'explorateur plusieurs fois en mode mesure (variable
+EXPLORATEUR_STARTUP_BENCH) ; l'application écrit les instants où la
+fenêtre est affichée et où les premières lignes sont dessinées, puis se
+ferme. Nécessite un affichage (DISPLAY, ou xvfb-run).
+
+Usage : python benchmarks/bench_startup.py [répétitions] [--max-window MS] [--max-first-row MS]
+Code de sortie 1 si une médiane dépasse le seuil donné (régression).
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "Explorateur de fichiers.py")
+TIMEOUT = 60
+
+
+def run_once():
+    env = dict(os.environ, EXPLORATEUR_STARTUP_BENCH="1")
+    start = time.time()
+    result = subprocess.run([sys.executable, SCRIPT], env=env, cwd=ROOT,
+                            capture_output=True, text=True, timeout=TIMEOUT)
+    marks = {}
+    for line in result.stdout.splitlines():
+        name, _, stamp = line.partition(" ")
+        if name in ("window", "first_row"):
+            marks[name] = (float(stamp) - start) * 1000
+    if len(marks) != 2:
+        raise RuntimeError(f"Mesure incomplète (code {result.returncode}) :\n{result.stderr}")
+    return marks
+
+
+def main():
+    args = sys.argv[1:]
+    limits = {}
+    for flag, name in (("--max-window", "window"), ("--max-first-row", "first_row")):
+        if flag in args:
+            i = args.index(flag)
+            limits[name] = float(args[i + 1])
+            del args[i:i + 2]
+    runs = int(args[0]) if args else 5
+
+    samples = {"window": [], "first_row": []}
+    for _ in range(runs):
+        for name, ms in run_once().items():
+            samples[name].append(ms)
+
+    failed = False
+    for name, label in (("window", "fenêtre affichée"), ("first_row", "premières lignes")):
+        median = statistics.median(samples[name])
+        line = (f"{label:<18} médiane {median:8.1f} ms   "
+                f"min {min(samples[name]):8.1f} ms   max {max(samples[name]):8.1f} ms")
+        if name in limits and median > limits[name]:
+            line += f"   RÉGRESSION (> {limits[name]:.0f} ms)"
+            failed = True
+        print(line)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
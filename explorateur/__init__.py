@@ -0,0 +1 @@
+"""Cœur de l'explorateur de fichiers (listing, filtres, recherche)"""
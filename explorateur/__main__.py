@@ -0,0 +1,6 @@
+"""python -m explorateur : voir explorateur.cli"""
+import sys
+
+from explorateur.cli import main
+
+sys.exit(main())
@@ -0,0 +1,265 @@
+"""Archives zip et tar parcourues comme des dossiers virtuels
+
+Un chemin virtuel prolonge celui de l'archive : « /x/photos.zip/2024/a.jpg ».
+Pour un zip, seul le répertoire central (en fin de fichier) est lu. Un tar
+n'a pas de répertoire : il est parcouru une seule fois, et la position de
+chaque membre dans le flux décompressé est enregistrée dans un index sur
+disque, sous le cache utilisateur. Les visites suivantes relisent cet
+index sans décompresser l'archive. Ouvrir un membre n'extrait que lui,
+dans un dossier temporaire supprimé à la fermeture. zipfile, tarfile et
+les décompresseurs ne sont importés qu'à l'ouverture d'une archive.
+"""
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from explorateur.listing import Entry
+from explorateur.storage import cache_dir, replacing
+
+ZIP_EXTENSIONS = (".zip", ".jar", ".whl")
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+INDEX_VERSION = 1
+MAX_OPEN_INDEXES = 8
+COPY_BUFFER = 1024 * 1024
+
+_indexes = OrderedDict()     # (chemin, mtime_ns, taille) -> ArchiveIndex
+_lock = threading.Lock()
+_temp_dirs = []
+
+
+def archive_format(name):
+    """« zip », « tar » ou None d'après l'extension"""
+    lower = name.lower()
+    if lower.endswith(ZIP_EXTENSIONS):
+        return "zip"
+    if lower.endswith(TAR_EXTENSIONS):
+        return "tar"
+    return None
+
+
+def is_archive(path):
+    """Fichier que l'on peut ouvrir comme un dossier"""
+    return archive_format(path) is not None and os.path.isfile(path)
+
+
+def split_archive_path(path):
+    """(archive, chemin intérieur) si path est une archive ou un chemin dans une archive
+
+    Le chemin intérieur vaut "" pour la racine de l'archive, None est
+    retourné pour un chemin ordinaire.
+    """
+    if os.path.isdir(path):
+        return None
+    candidate = path
+    while True:
+        if archive_format(candidate) and os.path.isfile(candidate):
+            inner = os.path.relpath(path, candidate)
+            return candidate, "" if inner == "." else inner.replace(os.sep, "/")
+        parent = os.path.dirname(candidate)
+        if parent == candidate or os.path.isdir(parent):
+            return None
+        candidate = parent
+
+
+def _normalize(name):
+    """Nom de membre sans « ./ », « / » initial, composante vide ni « .. »
+
+    « .. » ne doit pas devenir un dossier de l'archive (il ferait doublon
+    avec la ligne du dossier parent) ni permettre de sortir de l'archive.
+    """
+    parts = [p for p in name.replace("\\", "/").split("/") if p not in ("", ".", "..")]
+    return "/".join(parts)
+
+
+class ArchiveIndex:
+    """Arborescence d'une archive : dossier intérieur -> {nom: (est_dossier, taille, date, clé)}
+
+    La clé d'un fichier est son nom dans le zip, ou (position, taille) des
+    données dans le flux tar décompressé.
+    """
+
+    def __init__(self, path, kind, members):
+        self.path = path
+        self.kind = kind
+        self.dirs = {"": {}}
+        for name, is_dir, size, mtime, key in members:
+            name = _normalize(name)
+            if not name:
+                continue
+            parent, _, base = name.rpartition("/")
+            self._ensure_dir(parent, mtime)
+            if is_dir:
+                self._ensure_dir(name, mtime)
+            else:
+                self.dirs[parent][base] = [False, size, mtime, key]
+                # Taille des dossiers : somme de leur contenu, comptée en remontant
+                while parent:
+                    up, _, child = parent.rpartition("/")
+                    self.dirs[up][child][1] += size
+                    parent = up
+
+    def _ensure_dir(self, name, mtime):
+        if name in self.dirs:
+            return
+        parent, _, base = name.rpartition("/")
+        self._ensure_dir(parent, mtime)
+        self.dirs[name] = {}
+        self.dirs[parent][base] = [True, 0, mtime, None]
+
+    def entries(self, inner=""):
+        """Entry du dossier intérieur, triées par nom"""
+        children = self.dirs.get(inner)
+        if children is None:
+            raise FileNotFoundError(f"{inner} introuvable dans {self.path}")
+        return [Entry(name, is_dir, size, mtime)
+                for name, (is_dir, size, mtime, _) in sorted(children.items())]
+
+    def member(self, inner):
+        parent, _, base = inner.rpartition("/")
+        info = self.dirs.get(parent, {}).get(base)
+        if info is None or info[0]:
+            raise FileNotFoundError(f"{inner} introuvable dans {self.path}")
+        return info[3]
+
+
+def _zip_members(path):
+    import zipfile
+    with zipfile.ZipFile(path) as zf:  # Lit le répertoire central seulement
+        for info in zf.infolist():
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            yield info.filename, info.is_dir(), info.file_size, mtime, info.filename
+
+
+def _tar_members(path):
+    import tarfile
+    members = []
+    with tarfile.open(path, "r:*") as tf:
+        for info in tf:
+            if info.isdir():
+                members.append((info.name, True, 0, info.mtime, None))
+            elif info.isreg():
+                members.append((info.name, False, info.size, info.mtime,
+                                (info.offset_data, info.size)))
+    return members
+
+
+def _tar_index_file(path, st):
+    raw = f"{path}\0{st.st_mtime_ns}\0{st.st_size}".encode("utf-8", "surrogateescape")
+    return cache_dir("archives", hashlib.sha1(raw).hexdigest() + ".json")
+
+
+def _load_tar_members(path, st):
+    """Membres du tar, depuis l'index sur disque ou par un parcours unique du flux"""
+    index_file = _tar_index_file(path, st)
+    try:
+        with open(index_file) as f:
+            data = json.load(f)
+        if data.get("version") == INDEX_VERSION:
+            return [(name, is_dir, size, mtime, None if key is None else tuple(key))
+                    for name, is_dir, size, mtime, key in data["members"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    members = _tar_members(path)
+    try:
+        os.makedirs(os.path.dirname(index_file), exist_ok=True)
+        with replacing(index_file) as tmp, open(tmp, "w") as f:
+            json.dump({"version": INDEX_VERSION, "archive": path, "members": members}, f)
+    except OSError:
+        pass  # Cache en lecture seule : l'index sera refait à la prochaine visite
+    return members
+
+
+def open_index(path):
+    """ArchiveIndex de l'archive path (gardé en mémoire tant qu'elle ne change pas)"""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    import lzma
+    import tarfile
+    import zipfile
+    kind = archive_format(path)
+    try:
+        if kind == "zip":
+            members = list(_zip_members(path))
+        else:
+            members = _load_tar_members(path, st)
+    except (zipfile.BadZipFile, tarfile.TarError, EOFError, lzma.LZMAError) as e:
+        raise OSError(f"Archive illisible: {e}") from e
+    index = ArchiveIndex(path, kind, members)
+    with _lock:
+        _indexes[key] = index
+        while len(_indexes) > MAX_OPEN_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def list_archive(path, cancel=None):
+    """Entrées d'un chemin virtuel (archive ou dossier intérieur), source de DirectoryLoader"""
+    archive, inner = split_archive_path(path)
+    return open_index(archive).entries(inner)
+
+
+def _open_tar_stream(path):
+    """Flux décompressé du tar (la position d'un membre y est valable)"""
+    import bz2
+    import gzip
+    import lzma
+    with open(path, "rb") as f:
+        magic = f.read(6)
+    if magic.startswith(b"\x1f\x8b"):
+        return gzip.open(path, "rb")
+    if magic.startswith(b"BZh"):
+        return bz2.open(path, "rb")
+    if magic.startswith(b"\xfd7zXZ"):
+        return lzma.open(path, "rb")
+    return open(path, "rb")
+
+
+def extract_member(path):
+    """Extrait le fichier virtuel path dans un dossier temporaire ; retourne sa copie"""
+    archive, inner = split_archive_path(path)
+    index = open_index(archive)
+    key = index.member(inner)
+    directory = tempfile.mkdtemp(prefix="explorateur-")
+    _temp_dirs.append(directory)
+    target = os.path.join(directory, os.path.basename(inner))
+    import lzma
+    import zipfile
+    import zlib
+    try:
+        with open(target, "wb") as out:
+            if index.kind == "zip":
+                with zipfile.ZipFile(archive) as zf, zf.open(key) as src:
+                    shutil.copyfileobj(src, out, COPY_BUFFER)
+            else:
+                offset, size = key
+                with _open_tar_stream(archive) as src:
+                    src.seek(offset)  # Tar brut : accès direct ; compressé : décompression jusque-là
+                    while size > 0:
+                        chunk = src.read(min(size, COPY_BUFFER))
+                        if not chunk:
+                            raise OSError(f"Archive tronquée: {inner}")
+                        out.write(chunk)
+                        size -= len(chunk)
+    # Membre chiffré (RuntimeError), méthode non gérée, données corrompues
+    except (RuntimeError, NotImplementedError, zipfile.BadZipFile, zlib.error, EOFError,
+            lzma.LZMAError) as e:
+        raise OSError(f"Extraction impossible: {e}") from e
+    os.chmod(target, stat.S_IRUSR | stat.S_IWUSR)
+    return target
+
+
+def cleanup():
+    """Supprime les membres extraits pendant la session"""
+    while _temp_dirs:
+        shutil.rmtree(_temp_dirs.pop(), ignore_errors=True)
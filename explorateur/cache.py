@@ -0,0 +1,150 @@
+"""Cache LRU des listings de dossiers récents
+
+Chaque listing est validé par le st_mtime_ns du dossier au moment de la
+lecture. Les listings sont évincés du moins récent au plus récent dès
+que le nombre de listings, le nombre d'entrées ou le budget mémoire
+estimé est dépassé. Le cache est partagé entre le thread Tk et les
+threads de chargement.
+"""
+import os
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from operator import attrgetter
+
+from explorateur.core import list_directory
+
+MAX_LISTINGS = 64
+MAX_ENTRIES = 500000
+MAX_BYTES = 64 * 1024 * 1024
+ENTRY_BYTES = 120  # Estimation du coût d'un Entry, hors nom
+
+_name = attrgetter("name")
+
+
+def _estimate(entries):
+    return sum(ENTRY_BYTES + len(e.name) for e in entries)
+
+
+class ListingCache:
+    """Cache LRU {chemin: listing} avec compteurs de succès, d'échecs et d'évictions"""
+
+    def __init__(self, max_listings=MAX_LISTINGS, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_listings = max_listings
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._listings = OrderedDict()  # chemin -> [mtime_ns, entries, octets]
+        self._entries = 0
+        self._bytes = 0
+
+    def __contains__(self, path):
+        with self._lock:
+            return path in self._listings
+
+    def stats(self):
+        """Compteurs et occupation du cache"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "listings": len(self._listings), "entries": self._entries,
+                    "bytes": self._bytes}
+
+    def get(self, path):
+        """Listing en cache de path s'il est encore valide, sinon None"""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        with self._lock:
+            cached = self._listings.get(path)
+            if cached is None or cached[0] != mtime_ns:
+                if cached is not None:
+                    self._drop(path)
+                self.misses += 1
+                return None
+            self._listings.move_to_end(path)
+            self.hits += 1
+            return cached[1]
+
+    def put(self, path, mtime_ns, entries):
+        """Enregistre le listing de path (entries triées par nom)"""
+        size = _estimate(entries)
+        with self._lock:
+            if path in self._listings:
+                self._drop(path)
+            self._listings[path] = [mtime_ns, entries, size]
+            self._entries += len(entries)
+            self._bytes += size
+            while len(self._listings) > 1 and (
+                    len(self._listings) > self.max_listings
+                    or self._entries > self.max_entries
+                    or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._listings)))
+                self.evictions += 1
+
+    def update(self, path, changes):
+        """Applique {nom: Entry ou None} au listing en cache de path"""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            self.discard(path)
+            return
+        with self._lock:
+            cached = self._listings.get(path)
+            if cached is None:
+                return
+            entries = cached[1]
+            delta = 0
+            for name, entry in changes.items():
+                i = bisect_left(entries, name, key=_name)
+                if i < len(entries) and entries[i].name == name:
+                    delta -= ENTRY_BYTES + len(name)
+                    if entry is None:
+                        del entries[i]
+                        self._entries -= 1
+                    else:
+                        entries[i] = entry
+                        delta += ENTRY_BYTES + len(name)
+                elif entry is not None:
+                    entries.insert(i, entry)
+                    self._entries += 1
+                    delta += ENTRY_BYTES + len(name)
+            cached[0] = mtime_ns
+            cached[2] += delta
+            self._bytes += delta
+
+    def discard(self, path):
+        with self._lock:
+            if path in self._listings:
+                self._drop(path)
+
+    def _drop(self, path):
+        _, entries, size = self._listings.pop(path)
+        self._entries -= len(entries)
+        self._bytes -= size
+
+    def scan(self, path, cancel=None):
+        """Itère sur le listing de path et le met en cache s'il va jusqu'au bout"""
+        mtime_ns = os.stat(path).st_mtime_ns
+        entries = []
+        for entry in list_directory(path, cancel):
+            entries.append(entry)
+            yield entry
+        if cancel is None or not cancel.is_set():
+            entries.sort(key=_name)  # Produites dans l'ordre de readdir, gardées triées par nom
+            self.put(path, mtime_ns, entries)
+
+    def prefetch(self, paths):
+        """Charge en arrière-plan les dossiers absents du cache"""
+        def run():
+            for path in paths:
+                if path not in self and os.path.isdir(path):
+                    try:
+                        for _ in self.scan(path):
+                            pass
+                    except OSError:
+                        continue
+        threading.Thread(target=run, daemon=True).start()
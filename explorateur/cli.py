@@ -0,0 +1,128 @@
+"""Ligne de commande : les résultats du cœur en NDJSON (un objet JSON par ligne)
+
+    python -m explorateur ls DOSSIER [--sort]
+    python -m explorateur walk DOSSIER [--max-depth N]
+    python -m explorateur find DOSSIER TEXTE [--index]
+    python -m explorateur grep DOSSIER TEXTE [--regex]
+    python -m explorateur dups DOSSIER
+    python -m explorateur props CHEMIN
+
+Les filtres --filter, --min-size et --max-size s'appliquent à toutes les
+commandes de listing. Sauf avec --sort, rien n'est accumulé : la sortie
+commence immédiatement et la mémoire reste constante. --trace FICHIER
+enregistre durées et appels système (format Chrome trace).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from explorateur import core, instrument
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="python -m explorateur",
+                                     description="Explorateur de fichiers sans interface graphique")
+    parser.add_argument("--stats", action="store_true",
+                        help="bilan (nombre, durée) sur la sortie d'erreur")
+    parser.add_argument("--trace", metavar="FICHIER",
+                        help="mesurer les phases et appels système, trace Chrome dans FICHIER")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def command(name, help, query=False):
+        sub = commands.add_parser(name, help=help)
+        sub.add_argument("path")
+        if query:
+            sub.add_argument("query")
+        sub.add_argument("--filter", help="extensions ou motifs, ex. « .jpg;*.tar.gz »")
+        sub.add_argument("--min-size", type=int, help="taille minimale en octets")
+        sub.add_argument("--max-size", type=int, help="taille maximale en octets")
+        return sub
+
+    command("ls", "contenu d'un dossier").add_argument(
+        "--sort", action="store_true", help="ordre naturel, dossiers d'abord (garde tout en mémoire)")
+    command("walk", "toute l'arborescence").add_argument("--max-depth", type=int)
+    command("find", "noms contenant TEXTE", query=True).add_argument(
+        "--index", action="store_true", help="passer par l'index SQLite persistant")
+    grep = command("grep", "lignes des fichiers contenant TEXTE", query=True)
+    grep.add_argument("--regex", action="store_true", help="TEXTE est une expression régulière")
+    grep.add_argument("--max-file-size", type=int, help="ignorer les fichiers plus gros (octets)")
+    command("dups", "fichiers en double")
+    props = commands.add_parser("props", help="propriétés d'un fichier ou dossier")
+    props.add_argument("path")
+    return parser
+
+
+def _records(args):
+    """Dictionnaires à écrire pour la commande demandée"""
+    if args.command == "props":
+        yield core.properties(args.path)
+        return
+    accept = core.make_accept(args.filter, args.min_size, args.max_size)
+    root = args.path
+    if args.command == "ls":
+        entries = core.list_directory(root, accept=accept)
+        if args.sort:
+            from explorateur.sorting import SortOrder
+            entries = list(entries)
+            SortOrder().sort(entries)
+        for entry in entries:
+            yield core.entry_record(entry, root)
+    elif args.command == "walk":
+        for directory, entry in core.walk(root, accept, args.max_depth):
+            yield core.entry_record(entry, directory)
+    else:
+        if args.command == "find":
+            if args.index:
+                results = (e for e in core.search_index(root, args.query)
+                           if accept is None or accept(e))
+            else:
+                results = core.search_names(root, args.query, accept)
+        elif args.command == "grep":
+            limits = {} if args.max_file_size is None else {"max_file_size": args.max_file_size}
+            results = core.search_content(root, args.query, args.regex, accept, **limits)
+        else:
+            results = core.find_duplicates(root, accept)
+        for entry in results:
+            yield core.entry_record(entry, root)
+
+
+def main(argv=None):
+    args = _parser().parse_args(argv)
+    if args.command != "props" and not os.path.isdir(args.path):
+        print(json.dumps({"error": f"dossier introuvable: {args.path}"}), file=sys.stderr)
+        return 2
+    out = sys.stdout
+    count = 0
+    if args.trace:
+        instrument.recorder.enable()
+    command_span = instrument.begin(args.command)
+    start = time.perf_counter()
+    try:
+        for record in _records(args):
+            out.write(json.dumps(record))
+            out.write("\n")
+            count += 1
+        out.flush()
+    except BrokenPipeError:
+        # Lecteur fermé (ex. « | head ») : pas de trace d'erreur à la sortie
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, out.fileno())
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    except OSError as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        return 1
+    instrument.end(command_span, count)
+    if args.trace:
+        instrument.export_chrome_trace(args.trace)
+        for line in instrument.summary():
+            print(line, file=sys.stderr)
+    if args.stats:
+        elapsed = time.perf_counter() - start
+        print(json.dumps({"count": count, "seconds": round(elapsed, 3),
+                          "per_second": round(count / elapsed) if elapsed else None}),
+              file=sys.stderr)
+    return 0
@@ -0,0 +1,165 @@
+"""API sans interface graphique : listing, filtres, recherche, propriétés
+
+Tout est exposé sous forme de générateurs qui produisent les résultats au
+fil de l'eau : la mémoire reste constante quelle que soit la taille de
+l'arborescence (seule la pile des dossiers à visiter grandit). scan est
+le seul endroit où un dossier est lu, walk_dirents le seul parcours
+d'arborescence : le cache des listings, l'index, la recherche dans le
+contenu, les doublons, l'interface Tk et la ligne de commande
+(python -m explorateur) passent tous par eux.
+"""
+import os
+import stat
+import threading
+from datetime import datetime
+
+from explorateur.filters import EntryFilter
+from explorateur.listing import make_entry, make_name_matcher
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def scan(path):
+    """(os.DirEntry, Entry) pour chaque élément de path, dans l'ordre de readdir
+
+    Chaque entrée est produite dès sa lecture, sans tri ni liste : le
+    premier écran d'un très gros dossier n'attend pas la fin du readdir.
+    """
+    with os.scandir(path) as it:
+        for dirent in it:
+            yield dirent, make_entry(dirent)
+
+
+def list_directory(path, cancel=None, accept=None):
+    """Entrées d'un dossier dans l'ordre du système de fichiers (sans tri ni liste)
+
+    Même signature que les autres sources de DirectoryLoader : (path, cancel).
+    """
+    for _, entry in scan(path):
+        if cancel is not None and cancel.is_set():
+            return
+        if accept is None or accept(entry):
+            yield entry
+
+
+def walk_dirents(root, max_depth=None, cancel=None):
+    """(dossier, os.DirEntry, Entry) pour toute l'arborescence, sans suivre les liens
+
+    Parcours en profondeur ; les dossiers illisibles sont ignorés. Le
+    DirEntry donne accès au type sans suivre les liens et au stat mis en
+    cache (inode, st_mtime_ns) sans nouvel appel système.
+    """
+    stack = [(root, 0)]
+    while stack:
+        if cancel is not None and cancel.is_set():
+            return
+        directory, depth = stack.pop()
+        try:
+            entries = scan(directory)
+            for dirent, entry in entries:
+                if entry.is_dir and (max_depth is None or depth < max_depth):
+                    try:
+                        if not dirent.is_symlink():
+                            stack.append((dirent.path, depth + 1))
+                    except OSError:
+                        pass
+                yield directory, dirent, entry
+        except OSError:
+            continue
+
+
+def walk(root, accept=None, max_depth=None, cancel=None):
+    """(dossier, Entry) pour toute l'arborescence, sans suivre les liens symboliques
+
+    accept ne filtre que ce qui est produit : les dossiers refusés sont
+    tout de même parcourus. Les dossiers illisibles sont ignorés.
+    """
+    for directory, _, entry in walk_dirents(root, max_depth, cancel):
+        if accept is None or accept(entry):
+            yield directory, entry
+
+
+def search_names(root, query, accept=None, cancel=None):
+    """Éléments de l'arborescence dont le nom contient query (name : chemin relatif)"""
+    matches = make_name_matcher(query)
+    for directory, entry in walk(root, cancel=cancel):
+        if matches(entry) and (accept is None or accept(entry)):
+            entry.name = os.path.relpath(os.path.join(directory, entry.name), root)
+            yield entry
+
+
+def search_index(root, query, cancel=None):
+    """Comme search_names, via l'index SQLite persistant (rapide à partir du 2e appel)"""
+    from explorateur.index import recursive_search
+    yield from recursive_search(root, query, cancel=cancel)
+
+
+def search_content(root, query, regex=False, accept=None, cancel=None, searcher=None, **limits):
+    """Lignes des fichiers contenant query (ContentMatch), voir explorateur.grep
+
+    searcher : ContentSearch à réutiliser (son pool et ses compteurs), sinon
+    un pool est créé pour cette seule recherche.
+    """
+    from explorateur.grep import ContentSearch, compile_query
+    owned = searcher is None
+    if owned:
+        searcher = ContentSearch(**limits)
+    try:
+        yield from searcher.run(root, compile_query(query, regex),
+                                cancel or threading.Event(), accept=accept)
+    finally:
+        if owned:
+            searcher.shutdown()
+
+
+def find_duplicates(root, accept=None, cancel=None, finder=None):
+    """Fichiers en double (DuplicateEntry), groupe par groupe (finder : DuplicateFinder à réutiliser)"""
+    if finder is None:
+        from explorateur.duplicates import DuplicateFinder
+        finder = DuplicateFinder()
+    yield from finder.run(root, cancel or threading.Event(), accept=accept)
+
+
+def make_accept(extensions=None, min_size=None, max_size=None, newer_than=None):
+    """Filtre combinant une spécification « .jpg;*.tar.gz » et des bornes ; None si tout passe"""
+    accept = EntryFilter.parse(extensions) if extensions else None
+    if min_size is not None or max_size is not None or newer_than is not None:
+        bounds = EntryFilter(min_size=min_size, max_size=max_size, newer_than=newer_than)
+        accept = bounds & accept
+    return accept
+
+
+def properties(path, size=None):
+    """Propriétés d'un élément ; la taille d'un dossier est calculée si elle n'est pas fournie"""
+    st = os.stat(path)
+    is_dir = stat.S_ISDIR(st.st_mode)
+    if size is None:
+        size = directory_size(path) if is_dir else st.st_size
+    return {
+        "name": os.path.basename(os.path.normpath(path)),
+        "path": os.path.abspath(path),
+        "size": size,
+        "type": "Dossier" if is_dir else "Fichier",
+        "created": datetime.fromtimestamp(st.st_ctime).strftime(DATE_FORMAT),
+        "modified": datetime.fromtimestamp(st.st_mtime).strftime(DATE_FORMAT),
+    }
+
+
+def directory_size(path, cancel=None):
+    """Taille récursive d'un dossier (0 si illisible)"""
+    from explorateur.dirsize import DirSizeScanner
+    return DirSizeScanner().total_size(path, cancel) or 0
+
+
+def entry_record(entry, directory=None):
+    """Dictionnaire sérialisable (JSON) décrivant une entrée"""
+    path = entry.name if directory is None else os.path.join(directory, entry.name)
+    record = {"path": path, "type": "dir" if entry.is_dir else "file", "size": entry.size}
+    if not entry.is_dir:
+        record["mtime"] = entry.mtime
+    for field in ("line", "snippet", "group"):
+        value = getattr(entry, field, None)
+        if value is not None:
+            record[field] = value
+    return record
+
@@ -0,0 +1,133 @@
+"""Taille récursive des dossiers (comme du --apparent-size), en parallèle
+
+Chaque dossier est lu par une tâche d'un pool de threads, niveau par
+niveau, pour recouvrir la latence des montages réseau. Les liens
+symboliques ne sont pas suivis, un dossier déjà vu (même st_dev/st_ino)
+n'est compté qu'une fois, et par défaut on ne franchit pas les points de
+montage. Le total des fichiers directs de chaque dossier est mis en
+cache (LRU borné) sous (st_dev, st_ino), validé par st_mtime_ns : un
+nouveau calcul ne relit (scandir) que les dossiers modifiés, les autres
+ne coûtent qu'un lstat.
+"""
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+SCAN_WORKERS = 8
+PARALLEL_FOLDERS = 4
+FRONTIER_CHUNK = 256         # Dossiers soumis au pool à la fois (annulation entre deux)
+MAX_CACHED_FOLDERS = 100000
+MAX_CACHED_NAMES = 1000000   # Noms de sous-dossiers gardés, tous dossiers confondus
+
+
+class DirSizeScanner:
+    """Calcule les tailles de dossiers et livre les résultats par une file"""
+
+    def __init__(self, workers=SCAN_WORKERS, one_file_system=True,
+                 max_folders=MAX_CACHED_FOLDERS, max_names=MAX_CACHED_NAMES):
+        self.one_file_system = one_file_system
+        self.max_folders = max_folders
+        self.max_names = max_names
+        self.results = queue.Queue()  # (jeton, Entry, taille totale)
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="dirsize")
+        self._folders = ThreadPoolExecutor(PARALLEL_FOLDERS, thread_name_prefix="dirsize-root")
+        self._lock = threading.Lock()
+        # LRU (dev, ino) -> (mtime_ns, octets des fichiers directs, noms des sous-dossiers)
+        self._own = OrderedDict()
+        self._names = 0
+
+    def compute(self, directory, entries, cancel, token=None):
+        """Calcule en arrière-plan la taille des dossiers parmi entries
+
+        Chaque résultat est posé dans self.results sous la forme
+        (token, entry, total).
+        """
+        for entry in entries:
+            if entry.is_dir:
+                self._folders.submit(self._compute_one, os.path.join(directory, entry.name),
+                                     entry, cancel, token)
+
+    def submit(self, path, cancel=None):
+        """Future donnant la taille totale de path"""
+        return self._folders.submit(self.total_size, path, cancel)
+
+    def _compute_one(self, path, entry, cancel, token):
+        total = self.total_size(path, cancel)
+        if total is not None:
+            self.results.put((token, entry, total))
+
+    def total_size(self, path, cancel=None):
+        """Taille totale de path (None si annulé ou illisible)"""
+        try:
+            root_dev = os.lstat(path).st_dev
+        except OSError:
+            return None
+        seen = set()
+        total = 0
+        frontier = [path]
+        while frontier:
+            found = []
+            # Par tranches : un scan annulé libère vite le pool partagé
+            for i in range(0, len(frontier), FRONTIER_CHUNK):
+                if cancel is not None and cancel.is_set():
+                    return None
+                chunk = frontier[i:i + FRONTIER_CHUNK]
+                for result in self._pool.map(lambda p: self._read(p, root_dev, cancel), chunk):
+                    if result is None:
+                        continue
+                    inode, own, subdirs = result
+                    if inode in seen:
+                        continue  # Boucle (montage lié) ou dossier déjà compté
+                    seen.add(inode)
+                    total += own
+                    found.extend(subdirs)
+            frontier = found
+        return total
+
+    def _read(self, path, root_dev, cancel=None):
+        """(dev, ino), octets des fichiers directs et sous-dossiers de path"""
+        if cancel is not None and cancel.is_set():
+            return None
+        try:
+            st = os.lstat(path)
+        except OSError:
+            return None
+        if self.one_file_system and st.st_dev != root_dev:
+            return None
+        inode = (st.st_dev, st.st_ino)
+        with self._lock:
+            cached = self._own.get(inode)
+            if cached is not None and cached[0] == st.st_mtime_ns:
+                self._own.move_to_end(inode)
+                return inode, cached[1], [os.path.join(path, name) for name in cached[2]]
+
+        own = 0
+        names = []
+        try:
+            with os.scandir(path) as it:
+                for dirent in it:
+                    try:
+                        if dirent.is_dir(follow_symlinks=False):
+                            names.append(dirent.name)
+                        else:
+                            own += dirent.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            pass  # Dossier illisible : compté pour 0
+        self._remember(inode, st.st_mtime_ns, own, tuple(names))
+        return inode, own, [os.path.join(path, name) for name in names]
+
+    def _remember(self, inode, mtime_ns, own, names):
+        """Garde le résultat d'une lecture, en évinçant les dossiers les moins récents"""
+        with self._lock:
+            previous = self._own.pop(inode, None)
+            if previous is not None:
+                self._names -= len(previous[2])
+            self._own[inode] = (mtime_ns, own, names)
+            self._names += len(names)
+            while self._own and (len(self._own) > self.max_folders or self._names > self.max_names):
+                _, (_, _, evicted) = self._own.popitem(last=False)
+                self._names -= len(evicted)
@@ -0,0 +1,271 @@
+"""Recherche de fichiers en double
+
+Trois étapes, chacune ne gardant que les candidats encore possibles :
+1. un seul parcours os.scandir regroupe les fichiers par taille ;
+2. les groupes restants sont comparés sur une empreinte des premiers et
+   derniers Ko ;
+3. seuls les survivants sont hachés en entier, par grandes lectures,
+   dans un pool de threads (hashlib libère le GIL).
+Les liens physiques (même st_dev, st_ino) ne comptent qu'une fois : ce
+sont les mêmes données, pas des doublons. Les empreintes sont gardées
+dans un cache SQLite indexé par chemin et st_mtime_ns.
+"""
+import hashlib
+import os
+import sqlite3
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from explorateur import core
+from explorateur.listing import Entry
+from explorateur.storage import cache_file
+
+HASH_CACHE_FILE = "hashes.sqlite"  # Dans le dossier de cache utilisateur
+EDGE_SIZE = 4096              # Octets lus au début et à la fin (étape 2)
+READ_SIZE = 1024 * 1024       # Taille des lectures du hachage complet
+MIN_SIZE = 1                  # Les fichiers vides ne sont pas signalés
+HASH_WORKERS = 4
+PARTIAL_AHEAD = 16            # Empreintes partielles soumises d'avance, par thread
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    partial BLOB,
+    full BLOB
+);
+"""
+
+
+class DuplicateEntry(Entry):
+    """Fichier appartenant à un groupe de doublons (name : chemin relatif)"""
+
+    __slots__ = ("group", "count")
+
+    def __init__(self, name, size, mtime, group, count):
+        super().__init__(name, False, size, mtime)
+        self.group = group
+        self.count = count
+
+    @property
+    def type_label(self):
+        # Trier sur la colonne « Type » regroupe les doublons
+        return f"Doublons {self.group} (×{self.count})"
+
+
+def partial_hash(path, size):
+    """Empreinte des EDGE_SIZE premiers et derniers octets"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        digest.update(f.read(EDGE_SIZE))
+        if size > 2 * EDGE_SIZE:
+            f.seek(-EDGE_SIZE, os.SEEK_END)
+            digest.update(f.read(EDGE_SIZE))
+        elif size > EDGE_SIZE:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def full_hash(path, cancel=None):
+    """Empreinte du contenu entier, lu par blocs de READ_SIZE"""
+    digest = hashlib.blake2b(digest_size=16)
+    buffer = bytearray(READ_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            if cancel is not None and cancel.is_set():
+                return None
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.digest()
+
+
+class HashCache:
+    """Empreintes déjà calculées, valides tant que la date et la taille n'ont pas changé"""
+
+    def __init__(self, db_path=None):
+        self.db = sqlite3.connect(db_path or cache_file(HASH_CACHE_FILE))
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def get(self, path, mtime_ns, size):
+        """(partielle, complète) en cache, None pour ce qui manque"""
+        row = self.db.execute("SELECT mtime_ns, size, partial, full FROM hashes WHERE path = ?",
+                              (path,)).fetchone()
+        if row is None or row[0] != mtime_ns or row[1] != size:
+            return None, None
+        return row[2], row[3]
+
+    def put(self, path, mtime_ns, size, partial, full=None):
+        self.db.execute("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)",
+                        (path, mtime_ns, size, partial, full))
+
+
+class _File:
+    __slots__ = ("path", "size", "mtime_ns", "partial", "full")
+
+    def __init__(self, path, st):
+        self.path = path
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.partial = None
+        self.full = None
+
+
+class DuplicateFinder:
+    """Doublons sous un dossier ; les compteurs sont lisibles depuis le thread Tk"""
+
+    def __init__(self, db_path=None, workers=HASH_WORKERS, min_size=MIN_SIZE):
+        self.db_path = db_path
+        self.workers = workers
+        self.min_size = min_size
+        self.stage = ""
+        self.files_seen = 0
+        self.hardlinks = 0
+        self.bytes_hashed = 0
+        self.groups = 0
+        self.wasted = 0       # Octets récupérables en ne gardant qu'un exemplaire
+
+    def run(self, root, cancel, accept=None):
+        """Itère sur les DuplicateEntry, groupe par groupe, au fil du hachage complet"""
+        self.files_seen = self.hardlinks = self.bytes_hashed = self.groups = self.wasted = 0
+        # La connexion SQLite appartient au thread qui exécute le générateur
+        cache = HashCache(self.db_path)
+        try:
+            self.stage = "parcours"
+            by_size = self._walk(root, accept, cancel)
+            self.stage = "empreintes partielles"
+            candidates = self._by_partial_hash(by_size, cache, cancel)
+            # Les plus gros fichiers d'abord : c'est là que la place se gagne
+            candidates.sort(key=lambda files: files[0].size, reverse=True)
+            self.stage = "hachage complet"
+            for files in self._confirm(candidates, cache, cancel):
+                self.groups += 1
+                self.wasted += files[0].size * (len(files) - 1)
+                for f in sorted(files, key=lambda f: f.path):
+                    yield DuplicateEntry(os.path.relpath(f.path, root), f.size,
+                                         f.mtime_ns / 1e9, self.groups, len(files))
+            self.stage = "terminé"
+        finally:
+            cache.close()
+
+    def _walk(self, root, accept, cancel):
+        """Fichiers réguliers par taille, un seul chemin par inode"""
+        by_size = defaultdict(list)
+        inodes = set()
+        for _, dirent, entry in core.walk_dirents(root, cancel=cancel):
+            try:
+                if entry.is_dir or not dirent.is_file(follow_symlinks=False):
+                    continue
+                st = dirent.stat(follow_symlinks=False)  # Déjà en cache dans le DirEntry
+            except OSError:
+                continue
+            if st.st_size < self.min_size:
+                continue
+            if accept is not None and not accept(entry):
+                continue
+            self.files_seen += 1
+            inode = (st.st_dev, st.st_ino)
+            if inode in inodes:
+                self.hardlinks += 1  # Même données : pas un doublon
+                continue
+            inodes.add(inode)
+            by_size[st.st_size].append(_File(dirent.path, st))
+        return [files for files in by_size.values() if len(files) > 1]
+
+    def _by_partial_hash(self, groups, cache, cancel):
+        """Redécoupe les groupes de même taille selon l'empreinte partielle"""
+        todo = []
+        for files in groups:
+            if cancel.is_set():
+                return []
+            for f in files:
+                f.partial, f.full = cache.get(f.path, f.mtime_ns, f.size)
+                if f.partial is None:
+                    todo.append(f)
+        # Fenêtre glissante plutôt que pool.map : soumettre des dizaines de
+        # milliers de tâches d'un coup retarderait l'annulation d'autant
+        pool = ThreadPoolExecutor(self.workers)
+        window = deque()
+        try:
+            for f in todo:
+                if cancel.is_set():
+                    break
+                window.append((f, pool.submit(_partial, f)))
+                if len(window) >= self.workers * PARTIAL_AHEAD:
+                    self._store_partial(*window.popleft(), cache)
+            while window and not cancel.is_set():
+                self._store_partial(*window.popleft(), cache)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return self._split(groups, "partial")
+
+    def _store_partial(self, f, future, cache):
+        digest = future.result()
+        self.bytes_hashed += min(f.size, 2 * EDGE_SIZE)
+        f.partial = digest
+        if digest is not None:
+            # Un petit fichier est entièrement couvert par l'empreinte partielle
+            if f.size <= 2 * EDGE_SIZE:
+                f.full = digest
+            cache.put(f.path, f.mtime_ns, f.size, digest, f.full)
+
+    def _confirm(self, groups, cache, cancel):
+        """Hachage complet des candidats restants ; itère sur les groupes confirmés
+
+        Tous les hachages sont soumis d'emblée : le pool prend de l'avance
+        pendant que les premiers groupes sont affichés.
+        """
+        pool = ThreadPoolExecutor(self.workers)
+        try:
+            jobs = [(files, [(f, pool.submit(full_hash, f.path, cancel))
+                             for f in files if f.full is None])
+                    for files in groups]
+            for files, futures in jobs:
+                for f, future in futures:
+                    try:
+                        f.full = future.result()
+                    except OSError:
+                        continue
+                    if f.full is not None:
+                        self.bytes_hashed += f.size
+                        cache.put(f.path, f.mtime_ns, f.size, f.partial, f.full)
+                if cancel.is_set():
+                    return
+                yield from self._split([files], "full")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _split(groups, attr):
+        """Redécoupe chaque groupe selon attr ; garde les sous-groupes d'au moins deux"""
+        result = []
+        for files in groups:
+            buckets = defaultdict(list)
+            for f in files:
+                digest = getattr(f, attr)
+                if digest is not None:
+                    buckets[digest].append(f)
+            result.extend(b for b in buckets.values() if len(b) > 1)
+        return result
+
+
+def _partial(f):
+    try:
+        return partial_hash(f.path, f.size)
+    except OSError:
+        return None
+
+
+def prune_groups(entries):
+    """Retire les groupes de doublons réduits à un seul fichier (après suppression)"""
+    counts = defaultdict(int)
+    for entry in entries:
+        counts[entry.group] += 1
+    return [e for e in entries if counts[e.group] > 1]
@@ -0,0 +1,276 @@
+"""Opérations groupées sur les fichiers : copie, déplacement, suppression
+
+Les travaux passent par une file traitée par un thread dédié. Chaque
+travail expose sa progression (octets, débit, temps restant), peut être
+annulé puis repris : les fichiers terminés sont sautés et un fichier
+interrompu reprend à l'octet où il s'était arrêté. Les copies utilisent
+os.copy_file_range (copie dans le noyau, voire sur le serveur pour NFS),
+puis os.sendfile, et une boucle read/write en dernier recours. Un
+déplacement sur le même périphérique est un simple os.rename.
+"""
+import errno
+import os
+import queue
+import shutil
+import stat
+import threading
+import time
+
+CHUNK = 8 * 1024 * 1024  # Octets par appel : granularité de la progression et de l'annulation
+
+COPY, MOVE, DELETE = "copy", "move", "delete"
+LABELS = {COPY: "Copie", MOVE: "Déplacement", DELETE: "Suppression"}
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def unique_destination(directory, name, taken=()):
+    """Chemin libre dans directory pour name (« nom (copie) », « nom (copie 2) »...)
+
+    taken : chemins déjà promis à d'autres sources du même travail, pas
+    encore créés sur le disque.
+    """
+    path = os.path.join(directory, name)
+    if not os.path.lexists(path) and path not in taken:
+        return path
+    stem, ext = os.path.splitext(name)
+    n = 1
+    while True:
+        suffix = " (copie)" if n == 1 else f" (copie {n})"
+        path = os.path.join(directory, f"{stem}{suffix}{ext}")
+        if not os.path.lexists(path) and path not in taken:
+            return path
+        n += 1
+
+
+def _copy_range(src_fd, dst_fd, offset, count):
+    """Copie count octets à partir de offset ; retourne le nombre copié"""
+    global _copy_file_range_ok, _sendfile_ok
+    if _copy_file_range_ok:
+        try:
+            return os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM):
+                raise
+            _copy_file_range_ok = False
+    if _sendfile_ok:
+        try:
+            os.lseek(dst_fd, offset, os.SEEK_SET)
+            return os.sendfile(dst_fd, src_fd, offset, count)
+        except OSError as e:
+            if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                raise
+            _sendfile_ok = False
+    data = os.pread(src_fd, count, offset)
+    return os.pwrite(dst_fd, data, offset)
+
+
+_copy_file_range_ok = hasattr(os, "copy_file_range")
+_sendfile_ok = hasattr(os, "sendfile")
+
+
+class FileJob:
+    """Un travail groupé sur plusieurs sources"""
+
+    def __init__(self, kind, sources, destination=None):
+        self.kind = kind
+        self.sources = [os.path.abspath(s) for s in sources]
+        self.destination = destination
+        self.state = "pending"
+        self.error = None
+        self.total_bytes = 0
+        self.done_bytes = 0
+        self.total_items = 0
+        self.done_items = 0
+        self.touched = set()    # Dossiers dont le contenu a changé
+        self._plan = None       # Liste de (action, source, cible, taille)
+        self._next = 0          # Index de la prochaine étape du plan
+        self._offset = 0        # Octets déjà copiés du fichier en cours
+        self._cancel = threading.Event()
+        self._started = None
+        self._resumed_bytes = 0
+
+    @property
+    def label(self):
+        return LABELS[self.kind]
+
+    def cancel(self):
+        """Demande l'arrêt, que le travail soit en cours ou encore dans la file"""
+        self._cancel.set()
+
+    def resume(self):
+        """Prépare la reprise d'un travail annulé (à soumettre de nouveau)"""
+        self._cancel.clear()
+        self.state = "pending"
+
+    def progress(self):
+        """(fraction, débit en octets/s, secondes restantes ou None)"""
+        if self.total_bytes:
+            fraction = self.done_bytes / self.total_bytes
+        else:
+            fraction = self.done_items / self.total_items if self.total_items else 0.0
+        elapsed = time.monotonic() - self._started if self._started else 0
+        rate = (self.done_bytes - self._resumed_bytes) / elapsed if elapsed > 0 else 0.0
+        remaining = (self.total_bytes - self.done_bytes) / rate if rate > 0 else None
+        return fraction, rate, remaining
+
+    # --- Exécution (thread des opérations) -------------------------------
+
+    def run(self):
+        self.state = "running"
+        self._started = time.monotonic()
+        self._resumed_bytes = self.done_bytes
+        try:
+            self._check()  # Annulé pendant qu'il attendait dans la file
+            if self._plan is None:
+                self._plan = self._make_plan()
+                self.total_items = len(self._plan)
+                self.total_bytes = sum(step[3] for step in self._plan)
+            while self._next < len(self._plan):
+                self._check()
+                self._execute(*self._plan[self._next])
+                self._next += 1
+                self._offset = 0
+                self.done_items += 1
+            self.state = "done"
+        except JobCancelled:
+            self.state = "cancelled"
+        except Exception as e:  # Le thread des opérations doit survivre à tout travail
+            self.state = "error"
+            self.error = e
+
+    def _check(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def _make_plan(self):
+        plan = []
+        targets = set()  # Le plan est fait avant d'écrire : les cibles prévues comptent
+        for src in self.sources:
+            if self.kind == DELETE:
+                self.touched.add(os.path.dirname(src))
+                plan.extend(self._delete_plan(src))
+                continue
+            if self.kind == MOVE and os.path.samefile(os.path.dirname(src), self.destination):
+                continue  # Couper-coller dans le même dossier : rien à faire
+            self.touched.add(os.path.dirname(src))
+            dst = unique_destination(self.destination, os.path.basename(src), targets)
+            targets.add(dst)
+            if os.path.isdir(src) and not os.path.islink(src):
+                if (self.destination + os.sep).startswith(src + os.sep):
+                    raise OSError(errno.EINVAL, "Impossible de copier un dossier dans lui-même", src)
+            self.touched.add(self.destination)
+            if self.kind == MOVE and os.lstat(src).st_dev == os.stat(self.destination).st_dev:
+                plan.append(("rename", src, dst, 0))  # Même périphérique : simple renommage
+                continue
+            plan.extend(self._copy_plan(src, dst))
+            if self.kind == MOVE:
+                plan.extend(self._delete_plan(src))
+        return plan
+
+    def _copy_plan(self, src, dst):
+        # Parcours avec une pile explicite : pas de limite de profondeur
+        plan = []
+        stack = [(src, dst, False)]
+        while stack:
+            src, dst, leaving = stack.pop()
+            if leaving:
+                plan.append(("copystat", src, dst, 0))  # Après le contenu du dossier
+                continue
+            st = os.lstat(src)
+            if stat.S_ISLNK(st.st_mode):
+                plan.append(("symlink", src, dst, 0))
+            elif not stat.S_ISDIR(st.st_mode):
+                plan.append(("copy", src, dst, st.st_size))
+            else:
+                self._check()
+                plan.append(("mkdir", src, dst, 0))
+                stack.append((src, dst, True))
+                with os.scandir(src) as it:
+                    children = [(d.path, os.path.join(dst, d.name), False) for d in it]
+                stack.extend(reversed(children))
+        return plan
+
+    def _delete_plan(self, src):
+        # Enfants d'abord, dossier ensuite
+        plan = []
+        stack = [(src, False)]
+        while stack:
+            src, leaving = stack.pop()
+            if leaving:
+                plan.append(("rmdir", src, None, 0))
+            elif os.path.isdir(src) and not os.path.islink(src):
+                self._check()
+                stack.append((src, True))
+                with os.scandir(src) as it:
+                    stack.extend((d.path, False) for d in it)
+            else:
+                plan.append(("unlink", src, None, 0))
+        return plan
+
+    def _execute(self, action, src, dst, size):
+        if action == "copy":
+            self._copy_file(src, dst, size)
+        elif action == "mkdir":
+            os.makedirs(dst, exist_ok=True)
+        elif action == "copystat":
+            shutil.copystat(src, dst)
+        elif action == "symlink":
+            if not os.path.lexists(dst):
+                os.symlink(os.readlink(src), dst)
+        elif action == "rename":
+            os.rename(src, dst)
+        elif action == "rmdir":
+            os.rmdir(src)
+        elif action == "unlink":
+            try:
+                os.unlink(src)
+            except FileNotFoundError:
+                pass  # Déjà supprimé avant une reprise
+
+    def _copy_file(self, src, dst, size):
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            # Reprise : on garde ce qui a déjà été copié dans la cible
+            flags = os.O_WRONLY | os.O_CREAT | (0 if self._offset else os.O_TRUNC)
+            dst_fd = os.open(dst, flags, 0o666)
+            try:
+                offset = self._offset
+                while offset < size:
+                    self._check()
+                    copied = _copy_range(src_fd, dst_fd, offset, min(CHUNK, size - offset))
+                    if copied == 0:
+                        break  # Source raccourcie pendant la copie
+                    offset += copied
+                    self._offset = offset
+                    self.done_bytes += copied
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+        shutil.copystat(src, dst)
+
+
+class FileOperationQueue:
+    """File de travaux exécutés un par un dans un thread dédié"""
+
+    def __init__(self):
+        self.current = None
+        self.finished = queue.Queue()  # Travaux terminés, annulés ou en erreur
+        self._jobs = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, job):
+        """Ajoute (ou relance, pour une reprise) un travail"""
+        self._jobs.put(job)
+        return job
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            self.current = job
+            job.run()
+            self.current = None
+            self.finished.put(job)
@@ -0,0 +1,106 @@
+"""Filtres compilés pour le listing
+
+Un EntryFilter est préparé une fois (ensemble d'extensions, motifs glob
+regroupés en une seule expression régulière, bornes de taille et de
+date) puis appliqué à chaque entrée sans autre travail que les tests.
+Les dossiers passent toujours, comme dans l'explorateur d'origine.
+"""
+import fnmatch
+import re
+import time
+
+
+class EntryFilter:
+    """Prédicat compilé sur les entrées ; combinable avec &
+
+    Une entrée passe si son nom correspond à l'une des extensions ou à
+    l'un des motifs glob, et à regex, et si sa taille et sa date sont
+    dans les bornes données.
+    """
+
+    def __init__(self, extensions=None, globs=None, regex=None,
+                 min_size=None, max_size=None, newer_than=None, older_than=None):
+        self.extensions = frozenset(e.lower() for e in extensions) if extensions else None
+        self.globs = re.compile("|".join(fnmatch.translate(g.lower()) for g in globs)) if globs else None
+        self.regex = re.compile(regex, re.IGNORECASE) if isinstance(regex, str) else regex
+        self.min_size = min_size
+        self.max_size = max_size
+        self.newer_than = newer_than  # Horodatage minimal (mtime)
+        self.older_than = older_than
+        self._tests = [test for test in (
+            self._pattern_test(), self._regex_test(), self._size_test(), self._date_test())
+            if test is not None]
+
+    @classmethod
+    def parse(cls, spec):
+        """Filtre pour une spécification « .jpg;.png » ou « *.tar.gz;img_* »
+
+        Retourne None pour « * » (tout accepter).
+        """
+        parts = [p.strip() for p in spec.split(";") if p.strip()]
+        if not parts or parts == ["*"]:
+            return None
+        extensions = [p for p in parts if p.startswith(".") and not any(c in p for c in "*?[")]
+        globs = [p for p in parts if p not in extensions]
+        return cls(extensions=extensions, globs=globs)
+
+    @classmethod
+    def modified_within(cls, seconds):
+        """Fichiers modifiés depuis moins de seconds secondes"""
+        return cls(newer_than=time.time() - seconds)
+
+    def __call__(self, entry):
+        if entry.is_dir:
+            return True
+        for test in self._tests:
+            if not test(entry):
+                return False
+        return True
+
+    def __and__(self, other):
+        if other is None:
+            return self
+        return AllOf(self, other)
+
+    def __rand__(self, other):
+        return self.__and__(other)
+
+    def _pattern_test(self):
+        # Extensions et motifs glob : il suffit que l'un d'eux corresponde
+        extensions = self.extensions
+        match = None if self.globs is None else self.globs.match
+        if match is None:
+            return None if extensions is None else (lambda e: e.ext in extensions)
+        if extensions is None:
+            return lambda e: match(e.name.lower()) is not None
+        return lambda e: e.ext in extensions or match(e.name.lower()) is not None
+
+    def _regex_test(self):
+        search = None if self.regex is None else self.regex.search
+        return None if search is None else (lambda e: search(e.name) is not None)
+
+    def _size_test(self):
+        low, high = self.min_size, self.max_size
+        if low is None and high is None:
+            return None
+        low = 0 if low is None else low
+        high = float("inf") if high is None else high
+        return lambda e: low <= e.size <= high
+
+    def _date_test(self):
+        low, high = self.newer_than, self.older_than
+        if low is None and high is None:
+            return None
+        low = float("-inf") if low is None else low
+        high = float("inf") if high is None else high
+        return lambda e: low <= e.mtime <= high
+
+
+class AllOf(EntryFilter):
+    """Conjonction de filtres"""
+
+    def __init__(self, *filters):
+        self.filters = []
+        for f in filters:
+            self.filters.extend(f.filters if isinstance(f, AllOf) else [f])
+        self._tests = [f.__call__ for f in self.filters]
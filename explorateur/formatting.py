@@ -0,0 +1,47 @@
+"""Formatage mémorisé des colonnes Taille et Modifié le
+
+Les chaînes ne sont produites que pour les lignes affichées, et sont
+partagées : une seule chaîne internée par minute et par taille.
+"""
+import sys
+from datetime import datetime
+from functools import lru_cache
+
+MTIME_FORMAT = "%Y-%m-%d %H:%M"
+MAX_MTIME_STRINGS = 65536
+
+_mtime_strings = {}
+
+
+@lru_cache(maxsize=8192)
+def format_size(size):
+    """Formate la taille en unités lisible"""
+    for unit in ['', 'K', 'M', 'G', 'T']:
+        if size < 1024:
+            return f"{size:.1f}{unit}B"
+        size /= 1024
+    return f"{size:.1f}PB"
+
+
+def format_mtime(timestamp):
+    """Date de modification à la minute, une chaîne partagée par minute"""
+    minute = int(timestamp // 60)
+    text = _mtime_strings.get(minute)
+    if text is None:
+        if len(_mtime_strings) >= MAX_MTIME_STRINGS:
+            _mtime_strings.clear()
+        text = sys.intern(datetime.fromtimestamp(minute * 60).strftime(MTIME_FORMAT))
+        _mtime_strings[minute] = text
+    return text
+
+
+def format_duration(seconds):
+    """Durée lisible : « 42 s », « 3 min 20 s », « 1 h 05 min »"""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} min {seconds:02d} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} h {minutes:02d} min"
@@ -0,0 +1,268 @@
+"""Recherche dans le contenu des fichiers d'une arborescence
+
+Le parcours (os.scandir) reste dans le thread appelant ; les fichiers sont
+groupés en lots et fouillés dans un pool de processus, chacun projetant
+ses fichiers en mémoire (mmap) et cherchant avec bytes.find ou une regex
+compilée. Les binaires sont écartés d'après leurs premiers octets.
+"""
+import mmap
+import os
+import re
+import time
+from functools import lru_cache, partial
+
+from explorateur import core
+from explorateur.listing import Entry
+
+MAX_FILE_SIZE = 64 * 1024 * 1024   # Les fichiers plus gros sont ignorés
+MAX_MATCHES_PER_FILE = 50
+MAX_RESULTS = 5000
+SNIFF_SIZE = 8192
+SNIPPET_LENGTH = 160
+BATCH_FILES = 64                    # Fichiers par tâche envoyée au pool
+BATCH_BYTES = 8 * 1024 * 1024
+SEARCH_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+SCAN_CHUNK = 1024 * 1024            # Octets copiés à la fois (minuscules, comptage des lignes)
+
+# Octets de contrôle tolérés dans du texte : \t \n \f \r et ESC
+_TEXT_CONTROLS = frozenset(b"\t\n\x0c\r\x1b")
+_CONTROL_BYTES = bytes(b for b in range(32) if b not in _TEXT_CONTROLS)
+
+
+class ContentMatch(Entry):
+    """Ligne d'un fichier contenant le motif (name : chemin relatif)"""
+
+    __slots__ = ("line", "snippet")
+
+    def __init__(self, name, size, mtime, line, snippet):
+        super().__init__(name, False, size, mtime)
+        self.line = line
+        self.snippet = snippet
+
+
+def is_binary(head):
+    """Heuristique : octet nul, ou plus de 30 % d'octets de contrôle"""
+    if not head:
+        return False
+    if b"\0" in head:
+        return True
+    controls = len(head) - len(head.translate(None, _CONTROL_BYTES))
+    return controls * 10 > len(head) * 3
+
+
+def compile_query(query, regex=False):
+    """(motif, ignore_case) : casse ignorée si la requête est en minuscules"""
+    ignore_case = query == query.lower()
+    if regex:
+        re.compile(query)  # Lève re.error tout de suite, dans le thread Tk
+    return query, regex, ignore_case
+
+
+@lru_cache(maxsize=8)
+def _matcher(query, regex, ignore_case):
+    """searcher(texte) -> find(début) : position de la prochaine occurrence, ou -1
+
+    Le texte est le mmap lui-même. Un motif littéral est cherché avec
+    bytes.find, dans des tranches de SCAN_CHUNK octets mises en minuscules
+    une seule fois si la casse est ignorée : la mémoire ne dépend pas de
+    la taille du fichier. Une regex est appliquée directement au mmap.
+    """
+    needle = query.encode("utf-8")
+    if not regex and not ignore_case:
+        return lambda text: partial(text.find, needle)
+    if regex:
+        search = re.compile(needle, re.IGNORECASE if ignore_case else 0).search
+
+        def searcher(text):
+            def find(start):
+                match = search(text, start)
+                return -1 if match is None else match.start()
+            return find
+        return searcher
+    overlap = max(0, len(needle) - 1)  # Occurrence à cheval sur deux tranches
+
+    def folded_searcher(text):
+        window = [-1, b""]  # Début de la tranche courante, tranche en minuscules
+
+        def find(start):
+            while start < len(text):
+                base = start - start % SCAN_CHUNK
+                if window[0] != base:
+                    window[:] = base, text[base:base + SCAN_CHUNK + overlap].lower()
+                pos = window[1].find(needle, start - base)
+                if pos >= 0:
+                    return base + pos
+                start = base + SCAN_CHUNK
+            return -1
+        return find
+    return folded_searcher
+
+
+def grep_file(path, query, regex, ignore_case, max_matches=MAX_MATCHES_PER_FILE):
+    """(octets lus, [(ligne, extrait)]) pour un fichier ; exécuté dans le pool"""
+    searcher = _matcher(query, regex, ignore_case)
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or is_binary(f.read(SNIFF_SIZE)):
+                return 0, []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return size, _scan(mm, searcher(mm), max_matches)
+    except (OSError, ValueError):
+        return 0, []
+
+
+def _scan(mm, find, max_matches):
+    """Occurrences dans mm, une par ligne"""
+    matches = []
+    line, counted = 1, 0
+    pos = find(0)
+    while pos >= 0 and len(matches) < max_matches:
+        start = mm.rfind(b"\n", 0, pos) + 1
+        end = mm.find(b"\n", pos)
+        if end < 0:
+            end = len(mm)
+        line += _count_lines(mm, counted, start)
+        counted = start
+        text = mm[start:min(end, start + SNIPPET_LENGTH * 4)]
+        snippet = text.decode("utf-8", "replace").strip()[:SNIPPET_LENGTH]
+        matches.append((line, snippet))
+        pos = find(end + 1) if end < len(mm) else -1
+    return matches
+
+
+def _count_lines(mm, start, end):
+    """Fins de ligne entre start et end, par tranches de SCAN_CHUNK octets"""
+    count = 0
+    while start < end:
+        stop = min(end, start + SCAN_CHUNK)
+        count += mm[start:stop].count(b"\n")
+        start = stop
+    return count
+
+
+def grep_batch(paths, query, regex, ignore_case):
+    """Fouille un lot de fichiers : (octets lus, [(chemin, [(ligne, extrait)])])"""
+    scanned = 0
+    results = []
+    for path in paths:
+        size, matches = grep_file(path, query, regex, ignore_case)
+        scanned += size
+        if matches:
+            results.append((path, matches))
+    return scanned, results
+
+
+class ContentSearch:
+    """Recherche dans le contenu, avec son pool de processus et ses compteurs
+
+    run(root, pattern, cancel) est un générateur de ContentMatch, utilisable
+    comme source de DirectoryLoader ; bytes_scanned, files_scanned et rate
+    sont lisibles depuis le thread Tk pendant la recherche.
+    """
+
+    def __init__(self, workers=SEARCH_WORKERS, max_file_size=MAX_FILE_SIZE,
+                 max_results=MAX_RESULTS):
+        self.workers = workers
+        self.max_file_size = max_file_size
+        self.max_results = max_results
+        self._pool = None
+        self.bytes_scanned = 0
+        self.files_scanned = 0
+        self.skipped = 0        # Fichiers trop gros
+        self.truncated = False  # max_results atteint
+        self._started = None
+        self._finished = None
+
+    @property
+    def rate(self):
+        """Débit en octets/s de la dernière recherche"""
+        if self._started is None:
+            return 0.0
+        elapsed = (self._finished or time.monotonic()) - self._started
+        return self.bytes_scanned / elapsed if elapsed > 0 else 0.0
+
+    def run(self, root, pattern, cancel, accept=None):
+        """Itère sur les lignes correspondantes sous root, au fil des résultats"""
+        from concurrent.futures import FIRST_COMPLETED, wait
+        self.bytes_scanned = self.files_scanned = self.skipped = 0
+        self.truncated = False
+        self._started, self._finished = time.monotonic(), None
+        pool = self._get_pool()
+        pending = set()
+        found = 0
+        try:
+            for batch in self._batches(root, accept, cancel):
+                pending.add(pool.submit(grep_batch, batch, *pattern))
+                # Contre-pression : pas plus de quelques lots d'avance par processus
+                if len(pending) >= self.workers * 4:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for match in self._collect(done, root):
+                        yield match
+                        found += 1
+                if cancel.is_set() or found >= self.max_results:
+                    break
+            while pending and not cancel.is_set() and found < self.max_results:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for match in self._collect(done, root):
+                    yield match
+                    found += 1
+            self.truncated = found >= self.max_results
+        finally:
+            for future in pending:
+                future.cancel()
+            self._finished = time.monotonic()
+
+    def _collect(self, futures, root):
+        for future in futures:
+            if future.cancelled():
+                continue
+            scanned, results = future.result()
+            self.bytes_scanned += scanned
+            for path, matches in results:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                name = os.path.relpath(path, root)
+                for line, snippet in matches:
+                    yield ContentMatch(name, st.st_size, st.st_mtime, line, snippet)
+
+    def _batches(self, root, accept, cancel):
+        """Lots de chemins de fichiers à fouiller (parcours en largeur, sans suivre les liens)"""
+        batch, batch_bytes = [], 0
+        for _, dirent, entry in core.walk_dirents(root, cancel=cancel):
+            try:
+                if entry.is_dir or not dirent.is_file(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
+            if accept is not None and not accept(entry):
+                continue
+            if entry.size > self.max_file_size:
+                self.skipped += 1
+                continue
+            if entry.size == 0:
+                continue
+            self.files_scanned += 1
+            batch.append(dirent.path)
+            batch_bytes += entry.size
+            if len(batch) >= BATCH_FILES or batch_bytes >= BATCH_BYTES:
+                yield batch
+                batch, batch_bytes = [], 0
+        if batch:
+            yield batch
+
+    def _get_pool(self):
+        if self._pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn : les processus de recherche n'héritent pas de l'état de Tk
+            self._pool = ProcessPoolExecutor(self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
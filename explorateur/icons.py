@@ -0,0 +1,56 @@
+"""Icônes pré-réduites : chargées par Tk sans décoder l'image source
+
+Les icônes de dossier et de fichier sont livrées en PNG 16×16 à côté des
+images d'origine. Si l'image source est plus récente, la conversion est
+refaite une seule fois (PIL importé à ce moment seulement) et son
+résultat est réutilisé aux démarrages suivants.
+"""
+import os
+import tkinter as tk
+
+from explorateur.storage import cache_dir, replacing
+
+ICON_SIZE = 16
+
+
+def _is_fresh(baked, source):
+    try:
+        baked_mtime = os.path.getmtime(baked)
+    except OSError:
+        return False
+    try:
+        return baked_mtime >= os.path.getmtime(source)
+    except OSError:
+        return True  # Source absente : l'icône livrée fait foi
+
+
+def bake_icon(source, baked, size=ICON_SIZE):
+    """Réduit source en PNG size×size dans baked (import de PIL à la demande)"""
+    from PIL import Image
+    with Image.open(source) as image:
+        image.draft("RGB", (size, size))
+        image = image.resize((size, size))
+        os.makedirs(os.path.dirname(os.path.abspath(baked)), exist_ok=True)
+        with replacing(baked) as tmp:
+            image.save(tmp, "PNG")
+
+
+def load_icon(source, baked, fallback_color, size=ICON_SIZE):
+    """PhotoImage de l'icône : PNG pré-réduit, sinon conversion mise en cache, sinon aplat"""
+    candidates = [baked, cache_dir("icons", os.path.basename(baked))]
+    for candidate in candidates:
+        if _is_fresh(candidate, source):
+            return tk.PhotoImage(file=candidate)
+    if os.path.exists(source):
+        for candidate in candidates:
+            try:
+                bake_icon(source, candidate, size)
+                return tk.PhotoImage(file=candidate)
+            except (ImportError, OSError):
+                continue
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return tk.PhotoImage(file=candidate)  # Périmée mais utilisable
+    image = tk.PhotoImage(width=size, height=size)
+    image.put(fallback_color, to=(0, 0, size, size))
+    return image
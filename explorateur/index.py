@@ -0,0 +1,148 @@
+"""Index persistant des métadonnées (SQLite) pour la recherche récursive
+
+L'index stocke chemin, nom, taille, date et type de chaque élément. Il
+est rafraîchi de façon incrémentale : un dossier dont le st_mtime_ns n'a
+pas changé n'est pas relu, seuls ses sous-dossiers sont revérifiés.
+Limite connue : comme pour locate/updatedb, un fichier modifié sur place
+(sans création, suppression ni renommage) garde sa taille indexée
+jusqu'au prochain changement de son dossier.
+"""
+import os
+import sqlite3
+
+from explorateur import core
+from explorateur.listing import Entry
+from explorateur.storage import cache_file
+
+INDEX_FILE = "index.sqlite"  # Dans le dossier de cache utilisateur
+COMMIT_EVERY = 500  # Dossiers relus entre deux validations
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_parent ON entries(parent);
+"""
+
+
+def _subtree_bounds(path):
+    """Bornes [début, fin) des chemins strictement sous path"""
+    prefix = path.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+class MetadataIndex:
+    """Index SQLite des arborescences ; une instance par thread"""
+
+    def __init__(self, db_path=None):
+        self.db = sqlite3.connect(db_path or cache_file(INDEX_FILE))
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def refresh(self, root, cancel=None):
+        """Met l'index de root à jour ; retourne (dossiers relus, dossiers inchangés)"""
+        root = os.path.abspath(root)
+        db = self.db
+        rescanned = unchanged = 0
+        stack = [root]
+        while stack:
+            if cancel is not None and cancel.is_set():
+                break
+            path = stack.pop()
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                self._forget(path)
+                continue
+            row = db.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (path,)).fetchone()
+            if row is not None and row[0] == mtime_ns:
+                unchanged += 1
+                stack.extend(p for (p,) in db.execute(
+                    "SELECT path FROM entries WHERE parent = ? AND is_dir = 1", (path,)))
+                continue
+            stack.extend(self._rescan(path, mtime_ns))
+            rescanned += 1
+            if rescanned % COMMIT_EVERY == 0:
+                db.commit()
+        db.commit()
+        return rescanned, unchanged
+
+    def _rescan(self, path, mtime_ns):
+        """Relit un dossier, remplace ses entrées et retourne ses sous-dossiers"""
+        db = self.db
+        rows = []
+        subdirs = []
+        try:
+            for dirent, entry in core.scan(path):
+                try:
+                    # Ne pas suivre les liens : évite les boucles dans l'index
+                    is_dir = entry.is_dir and not dirent.is_symlink()
+                except OSError:
+                    continue
+                if is_dir:
+                    rows.append((dirent.path, path, entry.name, 1, 0, 0.0))
+                    subdirs.append(dirent.path)
+                else:
+                    rows.append((dirent.path, path, entry.name, 0, entry.size or 0, entry.mtime))
+        except OSError:
+            self._forget(path)
+            return []
+
+        kept = set(subdirs)
+        for (old,) in db.execute(
+                "SELECT path FROM entries WHERE parent = ? AND is_dir = 1", (path,)).fetchall():
+            if old not in kept:
+                self._forget(old)
+        db.execute("DELETE FROM entries WHERE parent = ?", (path,))
+        db.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+        db.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?)", (path, mtime_ns))
+        return subdirs
+
+    def _forget(self, path):
+        """Retire path et toute sa sous-arborescence de l'index"""
+        low, high = _subtree_bounds(path)
+        for table in ("entries", "dirs"):
+            self.db.execute(f"DELETE FROM {table} WHERE path = ? OR (path >= ? AND path < ?)",
+                            (path, low, high))
+
+    def search(self, root, query, limit=None):
+        """Itère sur les Entry dont le nom contient query, sous root
+
+        Le nom des résultats est le chemin relatif à root.
+        """
+        root = os.path.abspath(root)
+        low, high = _subtree_bounds(root)
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        sql = ("SELECT path, is_dir, size, mtime FROM entries "
+               "WHERE path >= ? AND path < ? AND name LIKE ? ESCAPE '\\' ORDER BY path")
+        params = [low, high, pattern]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        start = len(low)
+        for path, is_dir, size, mtime in self.db.execute(sql, params):
+            yield Entry(path[start:], bool(is_dir), None if is_dir else size, mtime)
+
+
+def recursive_search(root, query, db_path=None, cancel=None):
+    """Rafraîchit l'index de root puis itère sur les résultats de query"""
+    with MetadataIndex(db_path) as index:
+        index.refresh(root, cancel)
+        yield from index.search(root, query)
@@ -0,0 +1,294 @@
+"""Instrumentation des chemins critiques : durées par phase, compteurs, trace
+
+Désactivée par défaut : span() renvoie alors un objet vide partagé et
+begin()/end() ne font qu'un test, si bien que le coût reste négligeable.
+Une fois activée, chaque phase alimente un histogramme de latences (seaux
+en puissances de deux), un total d'éléments traités (→ éléments/s) et une
+liste bornée d'événements exportable au format Chrome trace
+(chrome://tracing, Perfetto). Les appels au système de fichiers
+(os.scandir, os.stat, os.lstat, os.listdir et DirEntry.stat) sont comptés
+en enveloppant ces fonctions du module os, seulement pendant l'activation.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+TRACE_ENV = "EXPLORATEUR_TRACE"  # Chemin du fichier de trace : activation dès le démarrage
+MAX_EVENTS = 100_000
+_BUCKETS = 40                    # Seau b : durées < 2**b µs
+
+
+class Histogram:
+    """Latences d'une phase, en seaux logarithmiques"""
+
+    __slots__ = ("buckets", "count", "total", "max", "items")
+
+    def __init__(self):
+        self.buckets = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.items = 0
+
+    def add(self, seconds, items=0):
+        self.buckets[min(_BUCKETS - 1, int(seconds * 1e6).bit_length())] += 1
+        self.count += 1
+        self.total += seconds
+        self.items += items
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """Borne haute (en secondes) du seau contenant le quantile demandé"""
+        rank = fraction * self.count
+        seen = 0
+        for b, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(self.max, (1 << b) / 1e6)
+        return self.max
+
+    @property
+    def rate(self):
+        """Éléments traités par seconde passée dans la phase"""
+        return self.items / self.total if self.total else 0.0
+
+
+class Recorder:
+    """Collecte des mesures ; une seule instance (recorder), partagée par les threads"""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.histograms = defaultdict(Histogram)
+            self.counters = defaultdict(int)
+            self.events = deque(maxlen=MAX_EVENTS)
+            self.origin = time.perf_counter()
+
+    def enable(self):
+        if not self.enabled:
+            self.enabled = True
+            _patch_os()
+
+    def disable(self):
+        if self.enabled:
+            self.enabled = False
+            _unpatch_os()
+
+    def record(self, name, start, end, items=0):
+        with self._lock:
+            self.histograms[name].add(end - start, items)
+            self.events.append((name, start, end, threading.get_ident(), items))
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+
+recorder = Recorder()
+
+
+class _Span:
+    __slots__ = ("name", "start", "items")
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.start = time.perf_counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        recorder.record(self.name, self.start, time.perf_counter(), self.items)
+        return False
+
+    def add(self, n=1):
+        """Compte n éléments traités dans la phase"""
+        self.items += n
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, n=1):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """Contexte mesurant une phase synchrone : with span("tri"): ..."""
+    return _Span(name) if recorder.enabled else _NULL_SPAN
+
+
+def begin(name):
+    """Début d'une phase asynchrone (finie par end dans un autre rappel) ; None si désactivé"""
+    return _Span(name) if recorder.enabled else None
+
+
+def end(token, items=0):
+    """Termine une phase commencée par begin"""
+    if token is not None and recorder.enabled:
+        token.items += items
+        token.__exit__()
+
+
+def count(name, n=1):
+    if recorder.enabled:
+        recorder.count(name, n)
+
+
+def timed(name):
+    """Décorateur : chaque appel de la fonction est une phase name"""
+    def decorate(func):
+        def wrapper(*args, **kwargs):
+            if not recorder.enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+    return decorate
+
+
+def _format_ms(seconds):
+    return f"{seconds * 1000:.1f} ms" if seconds < 1 else f"{seconds:.2f} s"
+
+
+def summary(limit=None):
+    """Lignes lisibles : phases (les plus coûteuses d'abord) puis compteurs"""
+    with recorder._lock:
+        phases = sorted(recorder.histograms.items(), key=lambda kv: kv[1].total, reverse=True)
+        counters = sorted(recorder.counters.items())
+    lines = []
+    for name, h in phases[:limit]:
+        line = (f"{name}: {h.count}× p50 {_format_ms(h.percentile(0.5))} "
+                f"p95 {_format_ms(h.percentile(0.95))} max {_format_ms(h.max)}")
+        if h.items:
+            line += f" — {h.rate:,.0f} él./s".replace(",", " ")
+        lines.append(line)
+    if counters:
+        lines.append("fs: " + ", ".join(f"{name} {n}" for name, n in counters))
+    return lines
+
+
+def export_chrome_trace(path):
+    """Écrit les événements au format Chrome trace (JSON) ; retourne leur nombre"""
+    pid = os.getpid()
+    with recorder._lock:
+        origin = recorder.origin
+        events = [{"name": name, "cat": "explorateur", "ph": "X", "pid": pid, "tid": tid,
+                   "ts": round((start - origin) * 1e6, 1), "dur": round((stop - start) * 1e6, 1),
+                   "args": {"items": items} if items else {}}
+                  for name, start, stop, tid, items in recorder.events]
+        now = round((time.perf_counter() - origin) * 1e6, 1)
+        if recorder.counters:
+            events.append({"name": "fs", "ph": "C", "pid": pid, "tid": 0, "ts": now,
+                           "args": dict(recorder.counters)})
+        histograms = {name: {"count": h.count, "total_s": h.total, "max_s": h.max,
+                             "p50_s": h.percentile(0.5), "p95_s": h.percentile(0.95),
+                             "items": h.items}
+                      for name, h in recorder.histograms.items()}
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                   "otherData": {"histograms": histograms}}, f)
+    return len(events)
+
+
+# --- Comptage des appels au système de fichiers ---------------------------
+
+_originals = {}
+
+
+class _CountingDirEntry:
+    """Enveloppe un os.DirEntry pour compter ses stat() (appels système réels)"""
+
+    __slots__ = ("_dirent", "name", "path")
+
+    def __init__(self, dirent):
+        self._dirent = dirent
+        self.name = dirent.name
+        self.path = dirent.path
+
+    def is_dir(self, *, follow_symlinks=True):
+        return self._dirent.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, *, follow_symlinks=True):
+        return self._dirent.is_file(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self):
+        return self._dirent.is_symlink()
+
+    def inode(self):
+        return self._dirent.inode()
+
+    def stat(self, *, follow_symlinks=True):
+        count("direntry.stat")
+        return self._dirent.stat(follow_symlinks=follow_symlinks)
+
+    def __fspath__(self):
+        return self.path
+
+
+class _CountingScandir:
+    def __init__(self, it):
+        self._it = it
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        dirent = next(self._it)
+        count("scandir.entries")
+        return _CountingDirEntry(dirent)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._it.close()
+
+
+def _counting(name, func):
+    def wrapper(*args, **kwargs):
+        count(name)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _patch_os():
+    if _originals:
+        return
+    for name in ("stat", "lstat", "listdir"):
+        _originals[name] = getattr(os, name)
+        setattr(os, name, _counting(name, _originals[name]))
+    scandir = _originals["scandir"] = os.scandir
+
+    def counting_scandir(*args, **kwargs):
+        count("scandir")
+        return _CountingScandir(scandir(*args, **kwargs))
+    os.scandir = counting_scandir
+
+
+def _unpatch_os():
+    for name, func in _originals.items():
+        setattr(os, name, func)
+    _originals.clear()
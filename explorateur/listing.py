@@ -0,0 +1,71 @@
+"""Entrées de dossier construites à partir de os.scandir (lu par core.scan)
+
+Le type de chaque entrée vient du DirEntry (d_type, sans appel système
+sur Linux) et seuls les fichiers sont stat-és, une seule fois.
+"""
+import os
+import stat
+
+
+class Entry:
+    """Enregistrement compact décrivant un élément d'un dossier
+
+    size vaut None pour un dossier tant que sa taille récursive n'est pas
+    connue.
+    """
+
+    __slots__ = ("name", "is_dir", "size", "mtime", "ext", "name_key")
+
+    def __init__(self, name, is_dir, size=None, mtime=0.0):
+        self.name = name
+        self.is_dir = is_dir
+        self.size = size
+        self.mtime = mtime
+        self.ext = "" if is_dir else os.path.splitext(name)[1].lower()
+        self.name_key = None  # Clé de tri naturelle, calculée à la demande (sorting)
+
+    @property
+    def type_label(self):
+        """Libellé affiché dans la colonne « Type »"""
+        if self.is_dir:
+            return "Dossier"
+        return self.ext[1:].upper() or "Fichier"
+
+    def __repr__(self):
+        return f"Entry({self.name!r}, is_dir={self.is_dir}, size={self.size})"
+
+
+def make_entry(dirent):
+    """Construit un Entry à partir d'un os.DirEntry"""
+    try:
+        is_dir = dirent.is_dir()
+    except OSError:
+        is_dir = False
+    if is_dir:
+        return Entry(dirent.name, True)
+    try:
+        st = dirent.stat()
+    except OSError:
+        # Lien cassé ou fichier disparu entre-temps
+        return Entry(dirent.name, False, 0)
+    return Entry(dirent.name, False, st.st_size, st.st_mtime)
+
+
+def stat_entry(directory, name):
+    """Entry pour directory/name, ou None si l'élément n'existe plus"""
+    path = os.path.join(directory, name)
+    try:
+        st = os.stat(path)
+    except OSError:
+        if os.path.lexists(path):
+            return Entry(name, False, 0)  # Lien cassé
+        return None
+    if stat.S_ISDIR(st.st_mode):
+        return Entry(name, True)
+    return Entry(name, False, st.st_size, st.st_mtime)
+
+
+def make_name_matcher(query):
+    """Prédicat : le nom contient la requête (insensible à la casse)"""
+    query = query.lower()
+    return lambda e: query in e.name.lower()
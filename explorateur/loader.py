@@ -0,0 +1,111 @@
+"""Chargement des dossiers dans un thread de travail
+
+Le thread énumère le dossier et envoie les entrées par lots dans une
+file ; le thread Tk vide la file avec root.after. Chaque chargement
+porte un numéro de génération : un nouveau chargement annule le
+précédent et les lots périmés sont ignorés.
+"""
+import queue
+import threading
+
+from explorateur import core, instrument
+from explorateur.sorting import natural_key
+
+FIRST_BATCH = 64     # Premier lot réduit pour afficher vite le premier écran
+BATCH_SIZE = 1000
+POLL_MS = 15
+MAX_MESSAGES_PER_POLL = 4
+
+
+class DirectoryLoader:
+    """Charge des dossiers en arrière-plan et livre les lots au thread Tk"""
+
+    def __init__(self, root):
+        self.root = root
+        self._queue = queue.Queue()
+        self._generation = 0
+        self._cancel = threading.Event()
+        self._callbacks = None
+        self._after_id = None
+
+    @property
+    def busy(self):
+        return self._callbacks is not None
+
+    def load(self, path, on_batch, on_done, on_error, accept=None, source=None):
+        """Démarre le chargement de path ; annule le chargement en cours
+
+        accept filtre les entrées dans le thread de travail ; source
+        remplace core.list_directory (par exemple pour une recherche) et reçoit
+        (path, cancel), cancel étant l'Event d'annulation du chargement.
+        on_done reçoit le nombre total d'entrées énumérées.
+        """
+        self.cancel()
+        self._generation += 1
+        self._cancel = threading.Event()
+        self._callbacks = (on_batch, on_done, on_error)
+        worker = threading.Thread(
+            target=self._run,
+            args=(self._generation, self._cancel, path, accept, source or core.list_directory),
+            daemon=True)
+        worker.start()
+        self._schedule()
+
+    def cancel(self):
+        """Annule le chargement en cours (ses lots restants seront ignorés)"""
+        self._cancel.set()
+        self._callbacks = None
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _run(self, generation, cancel, path, accept, source):
+        put = self._queue.put
+        batch = []
+        limit = FIRST_BATCH
+        total = 0
+        try:
+            with instrument.span("listing") as span:
+                for entry in source(path, cancel):
+                    if cancel.is_set():
+                        return
+                    total += 1
+                    if accept is None or accept(entry):
+                        natural_key(entry)  # Clé de tri précalculée hors du thread Tk
+                        batch.append(entry)
+                        if len(batch) >= limit:
+                            put((generation, "batch", batch))
+                            batch = []
+                            limit = BATCH_SIZE
+                span.add(total)
+        except Exception as e:
+            put((generation, "error", e))
+            return
+        if batch:
+            put((generation, "batch", batch))
+        put((generation, "done", total))
+
+    def _schedule(self):
+        self._after_id = self.root.after(POLL_MS, self._drain)
+
+    def _drain(self):
+        self._after_id = None
+        for _ in range(MAX_MESSAGES_PER_POLL):
+            try:
+                generation, kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._generation or self._callbacks is None:
+                continue  # Lot d'un chargement annulé
+            on_batch, on_done, on_error = self._callbacks
+            if kind == "batch":
+                on_batch(payload)
+            else:
+                self._callbacks = None
+                if kind == "done":
+                    on_done(payload)
+                else:
+                    on_error(payload)
+                return
+        if self._callbacks is not None:
+            self._schedule()
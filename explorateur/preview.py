@@ -0,0 +1,209 @@
+"""Aperçu rapide des fichiers : texte, hexadécimal, image
+
+Seuls les octets de la zone affichée sont lus (mmap pour le texte, pread
+pour l'hexadécimal) : un journal de plusieurs Go s'affiche aussitôt et se
+parcourt page par page. La position de défilement est un décalage en
+octets, comme dans less : aller à la fin ne demande pas de compter les
+lignes. Les pages sont préparées dans un thread, la demande en attente
+est abandonnée quand la sélection change, et un petit LRU rend
+instantané le va-et-vient entre fichiers voisins.
+"""
+import mmap
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from explorateur.grep import is_binary
+
+PREVIEW_LINES = 60
+MAX_LINE_BYTES = 2048        # Au-delà, une ligne est coupée en segments
+HEX_WIDTH = 16
+IMAGE_SIZE = 256
+MAX_PREVIEWS = 32
+SNIFF_SIZE = 4096
+IMAGE_EXTENSIONS = frozenset({".png", ".gif", ".jpg", ".jpeg", ".bmp", ".webp", ".ico"})
+TK_IMAGE_EXTENSIONS = frozenset({".png", ".gif"})  # Lisibles par Tk sans PIL
+
+TEXT, HEX, IMAGE = "text", "hex", "image"
+
+
+class Page:
+    """Résultat d'un aperçu : une page de texte ou d'hexadécimal, ou une image"""
+
+    __slots__ = ("kind", "path", "offset", "end", "size", "text", "starts", "image", "error")
+
+    def __init__(self, kind, path, offset=0, end=0, size=0, text="", starts=(), image=None,
+                 error=None):
+        self.kind = kind
+        self.path = path
+        self.offset = offset      # Premier octet affiché
+        self.end = end            # Octet suivant le dernier affiché
+        self.size = size
+        self.text = text
+        self.starts = starts      # Début de chaque ligne affichée (défilement ligne à ligne)
+        self.image = image        # PNG réduit (octets), ou None : Tk lit le fichier lui-même
+        self.error = error
+
+
+def detect_kind(path):
+    """Mode d'aperçu par défaut : image d'après l'extension, sinon texte ou hexadécimal"""
+    if os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+        return IMAGE
+    with open(path, "rb") as f:
+        return HEX if is_binary(f.read(SNIFF_SIZE)) else TEXT
+
+
+def _line_end(mm, pos):
+    """Fin de la ligne commençant à pos (coupée après MAX_LINE_BYTES)"""
+    limit = min(len(mm), pos + MAX_LINE_BYTES)
+    end = mm.find(b"\n", pos, limit)
+    return limit if end < 0 else end + 1
+
+
+def _back_lines(mm, pos, count):
+    """Début de la ligne située count lignes avant pos"""
+    for _ in range(count):
+        if pos <= 0:
+            return 0
+        start = mm.rfind(b"\n", max(0, pos - 1 - MAX_LINE_BYTES), pos - 1) + 1
+        if start == 0 and pos - 1 > MAX_LINE_BYTES:
+            start = pos - MAX_LINE_BYTES  # Ligne trop longue : recul d'un segment
+        pos = start
+    return pos
+
+
+def text_page(path, offset=0, back=0, lines=PREVIEW_LINES, align=False):
+    """Page de texte à partir de offset (reculé de back lignes)
+
+    align : offset vient de la barre de défilement et peut tomber en milieu
+    de ligne ; la page commence alors à la ligne suivante.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return Page(TEXT, path)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offset = max(0, min(offset, size - 1))
+            if align and offset > 0 and mm[offset - 1:offset] != b"\n":
+                offset = _line_end(mm, offset)
+                if offset >= size:
+                    offset = _back_lines(mm, size, lines)
+            if back:
+                offset = _back_lines(mm, offset, back)
+            starts = []
+            pos = offset
+            while pos < size and len(starts) < lines:
+                starts.append(pos)
+                pos = _line_end(mm, pos)
+            text = mm[offset:pos].decode("utf-8", "replace")
+    return Page(TEXT, path, offset, pos, size, text, starts)
+
+
+def hex_page(path, offset=0, rows=PREVIEW_LINES):
+    """Page hexadécimale (HEX_WIDTH octets par ligne) lue par pread"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        offset = max(0, min(offset, size - 1)) // HEX_WIDTH * HEX_WIDTH
+        data = os.pread(fd, rows * HEX_WIDTH, offset) if size else b""
+    finally:
+        os.close(fd)
+    lines = []
+    for i in range(0, len(data), HEX_WIDTH):
+        chunk = data[i:i + HEX_WIDTH]
+        ascii_part = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+        lines.append(f"{offset + i:08x}  {chunk.hex(' '):<{HEX_WIDTH * 3 - 1}}  |{ascii_part}|")
+    return Page(HEX, path, offset, offset + len(data), size, "\n".join(lines),
+                tuple(range(offset, offset + len(data), HEX_WIDTH)))
+
+
+def image_page(path, size=IMAGE_SIZE):
+    """Image réduite à size×size, encodée en PNG (PIL) ; sans PIL, Tk lira le fichier"""
+    file_size = os.path.getsize(path)
+    try:
+        from PIL import Image
+    except ImportError:
+        if os.path.splitext(path)[1].lower() in TK_IMAGE_EXTENSIONS:
+            return Page(IMAGE, path, size=file_size)
+        return Page(IMAGE, path, size=file_size, error="Aperçu d'image indisponible (PIL absent)")
+    import io
+    try:
+        with Image.open(path) as image:
+            image.draft("RGB", (size, size))
+            image.thumbnail((size, size))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            out = io.BytesIO()
+            image.save(out, "PNG")
+    except Exception as e:
+        return Page(IMAGE, path, size=file_size, error=f"Image illisible: {e}")
+    return Page(IMAGE, path, size=file_size, image=out.getvalue())
+
+
+def build_page(path, kind=None, offset=0, back=0, align=False):
+    """Calcule un aperçu (exécuté dans le thread d'aperçu) ; kind None : détection"""
+    try:
+        if kind is None:
+            kind = detect_kind(path)
+        if kind == IMAGE:
+            return image_page(path)
+        if kind == HEX:
+            return hex_page(path, max(0, offset - back * HEX_WIDTH))
+        return text_page(path, offset, back, align=align)
+    except (OSError, ValueError) as e:
+        return Page(kind, path, error=str(e))
+
+
+class PreviewLoader:
+    """Une seule demande en cours ; les anciennes sont abandonnées, les pages gardées en LRU"""
+
+    def __init__(self, max_previews=MAX_PREVIEWS):
+        self.max_previews = max_previews
+        self._pages = OrderedDict()
+        self._pool = ThreadPoolExecutor(1, thread_name_prefix="preview")
+        self._pending = None     # (clé, Future)
+
+    def request(self, path, kind=None, offset=0, back=0, align=False):
+        """Page en cache retournée tout de suite, sinon None et calcul lancé (voir poll)"""
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            return Page(kind, path, error=str(e))
+        key = (path, st.st_mtime_ns, st.st_size, kind, offset, back, align)
+        page = self._pages.get(key)
+        if page is not None:
+            self._pages.move_to_end(key)
+            self.cancel()
+            return page
+        if self._pending is not None and self._pending[0] == key:
+            return None
+        self.cancel()
+        self._pending = (key, self._pool.submit(build_page, path, kind, offset, back, align))
+        return None
+
+    def poll(self):
+        """Page de la demande en cours si elle est prête"""
+        if self._pending is None or not self._pending[1].done():
+            return None
+        key, future = self._pending
+        self._pending = None
+        page = future.result()
+        if page.error is None:
+            self._pages[key] = page
+            if len(self._pages) > self.max_previews:
+                self._pages.popitem(last=False)
+        return page
+
+    @property
+    def busy(self):
+        return self._pending is not None
+
+    def cancel(self):
+        """Abandonne la demande en cours (la sélection a changé)"""
+        if self._pending is not None:
+            self._pending[1].cancel()
+            self._pending = None
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,98 @@
+"""Tri des listings : ordre naturel des noms, dossiers d'abord, multi-clés
+
+Les clés sont numériques (taille, date brutes) ou précalculées une fois
+par entrée (nom naturel, mis en cache dans Entry.name_key) : retrier un
+listing ne fait ni stat ni analyse de chaînes formatées.
+"""
+import locale
+import re
+from bisect import bisect_left
+from functools import cmp_to_key
+
+_DIGITS = re.compile(r"(\d+)")
+
+# Colonnes du Treeview -> champ de tri
+COLUMN_FIELDS = {"#0": "name", "Size": "size", "Type": "type", "Modified": "mtime"}
+
+
+def natural_key(entry):
+    """Clé « naturelle » du nom (fichier2 < fichier10), selon la locale"""
+    key = entry.name_key
+    if key is None:
+        parts = _DIGITS.split(entry.name.casefold())
+        # Alternance texte / nombre : les comparaisons restent homogènes
+        key = tuple(int(part) if i % 2 else locale.strxfrm(part) for i, part in enumerate(parts))
+        entry.name_key = key
+    return key
+
+
+def _size_key(entry):
+    return -1 if entry.size is None else entry.size
+
+
+_KEYS = {
+    "name": natural_key,
+    "size": _size_key,
+    "type": lambda e: e.type_label,  # Le libellé affiché (groupes de doublons compris)
+    "mtime": lambda e: e.mtime,
+}
+
+
+class SortOrder:
+    """Ordre de tri courant : liste de (champ, décroissant), dossiers d'abord"""
+
+    def __init__(self, keys=(("name", False),), dirs_first=True):
+        self.keys = list(keys)
+        self.dirs_first = dirs_first
+
+    def toggle(self, field, add=False):
+        """Clic sur une colonne : inverse le sens si elle est déjà la clé
+        principale, sinon en fait la clé principale (ou secondaire si add)"""
+        for i, (current, descending) in enumerate(self.keys):
+            if current == field:
+                if i == 0 or add:
+                    self.keys[i] = (field, not descending)
+                    return
+                del self.keys[i]
+                break
+        if add:
+            # Avant le départage final par nom : après lui, la clé n'aurait aucun effet
+            tail = len(self.keys)
+            if tail > 1 and self.keys[-1][0] == "name":
+                tail -= 1
+            self.keys.insert(tail, (field, False))
+        else:
+            self.keys = [(field, False)] + [k for k in self.keys if k[0] == "name"][:1]
+
+    def indicator(self, field):
+        """Flèche à afficher dans l'en-tête de la colonne field"""
+        for current, descending in self.keys:
+            if current == field:
+                return " ▼" if descending else " ▲"
+        return ""
+
+    def sort(self, entries):
+        """Trie entries en place (tri stable, clé la moins significative d'abord)"""
+        for field, descending in reversed(self.keys):
+            entries.sort(key=_KEYS[field], reverse=descending)
+        if self.dirs_first:
+            entries.sort(key=lambda e: not e.is_dir)
+
+    def _compare(self, a, b):
+        if self.dirs_first and a.is_dir != b.is_dir:
+            return -1 if a.is_dir else 1
+        for field, descending in self.keys:
+            key = _KEYS[field]
+            ka, kb = key(a), key(b)
+            if ka != kb:
+                return (1 if ka < kb else -1) if descending else (-1 if ka < kb else 1)
+        return 0
+
+    def position(self, rows, entry, lo=0):
+        """Index où insérer entry dans rows déjà triées (à partir de lo)
+
+        Sert aux petits lots de changements : une ligne ajoutée ou retirée
+        est placée par dichotomie, sans retrier la vue.
+        """
+        key = cmp_to_key(self._compare)
+        return bisect_left(rows, key(entry), lo=lo, key=key)
@@ -0,0 +1,42 @@
+"""Fichiers de cache de l'explorateur : emplacement et écriture atomique
+
+Tout ce qui se recalcule (icônes, miniatures, index des archives, index
+des métadonnées, empreintes des doublons) va sous le cache utilisateur,
+$XDG_CACHE_HOME/explorateur (par défaut ~/.cache/explorateur), jamais
+dans le dossier courant.
+"""
+import os
+from contextlib import contextmanager
+
+
+def cache_dir(*parts):
+    """Chemin sous le dossier de cache de l'explorateur (non créé)"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "explorateur", *parts)
+
+
+def cache_file(name):
+    """Chemin de name dans le dossier de cache, créé au besoin"""
+    directory = cache_dir()
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, name)
+
+
+@contextmanager
+def replacing(path):
+    """Nom temporaire à écrire, qui remplace path d'un coup en sortie de bloc
+
+    Un lecteur (autre processus, autre instance) voit l'ancien fichier ou
+    le nouveau, jamais un fichier à moitié écrit. En cas d'erreur, le
+    fichier temporaire est supprimé et path reste intact.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,70 @@
+"""Index trigrammes des noms d'un listing pour la recherche en direct
+
+L'index est construit une fois par chargement de dossier, dans un thread
+pour les gros listings ; tant qu'il n'est pas prêt, les requêtes font un
+simple parcours linéaire. Une requête qui prolonge la précédente est
+résolue en filtrant les résultats précédents, sans repasser sur tout le
+listing.
+"""
+import threading
+
+INDEX_THRESHOLD = 5000  # En dessous, le parcours linéaire suffit
+
+
+class NameIndex:
+    """Index trigrammes (noms en minuscules) d'une liste d'entrées"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.names = [e.name.lower() for e in entries]
+        self._postings = None
+        if len(self.names) >= INDEX_THRESHOLD:
+            threading.Thread(target=self._build, daemon=True).start()
+
+    def _build(self):
+        postings = {}
+        for i, name in enumerate(self.names):
+            for gram in {name[j:j + 3] for j in range(len(name) - 2)}:
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = [i]
+                else:
+                    posting.append(i)
+        self._postings = postings
+
+    def search(self, query, within=None):
+        """Indices des noms contenant query (en minuscules)
+
+        within restreint la recherche à des indices déjà trouvés.
+        """
+        names = self.names
+        if within is not None:
+            candidates = within
+        elif len(query) < 3 or self._postings is None:
+            candidates = range(len(names))
+        else:
+            postings = [self._postings.get(query[j:j + 3], ())
+                        for j in range(len(query) - 2)]
+            candidates = min(postings, key=len)
+        return [i for i in candidates if query in names[i]]
+
+
+class LiveSearch:
+    """Filtrage incrémental d'un listing au fil de la frappe"""
+
+    def __init__(self, entries):
+        self.index = NameIndex(entries)
+        self._query = ""
+        self._hits = None
+
+    def update(self, query):
+        """Retourne les entrées dont le nom contient query"""
+        query = query.lower()
+        if not query:
+            self._query, self._hits = "", None
+            return list(self.index.entries)
+        within = self._hits if self._query and self._query in query else None
+        self._hits = self.index.search(query, within)
+        self._query = query
+        entries = self.index.entries
+        return [entries[i] for i in self._hits]
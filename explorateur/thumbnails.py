@@ -0,0 +1,167 @@
+"""Icônes par type de fichier et miniatures d'images
+
+Les miniatures sont décodées et réduites par PIL dans un pool de
+processus, jamais dans le thread Tk. Le résultat est écrit en PNG dans
+un cache disque adressé par le contenu (chemin + date + taille) : rouvrir
+un dossier de photos ne décode plus rien, Tk relit directement le PNG.
+Un LRU borné garde en mémoire les PhotoImage les plus récents.
+"""
+import hashlib
+import os
+import queue
+import tkinter as tk
+from collections import OrderedDict
+
+from explorateur.storage import cache_dir, replacing
+
+THUMBNAIL_SIZE = 16
+THUMBNAIL_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif"})
+MAX_IMAGES = 512
+RENDER_WORKERS = 2
+
+# Couleur de l'icône par famille d'extensions
+TYPE_COLORS = {
+    "image": ("#2e8b57", {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp"}),
+    "document": ("#1e63b5", {".txt", ".pdf", ".doc", ".docx", ".odt", ".md", ".rtf"}),
+    "tableur": ("#1f7a3a", {".xls", ".xlsx", ".ods", ".csv"}),
+    "archive": ("#a0522d", {".zip", ".tar", ".gz", ".bz2", ".xz", ".7z", ".rar", ".tgz"}),
+    "code": ("#6a3d9a", {".py", ".c", ".h", ".cpp", ".js", ".ts", ".java", ".rs", ".go",
+                         ".html", ".css", ".json", ".xml", ".sh"}),
+    "audio": ("#c71585", {".mp3", ".wav", ".flac", ".ogg", ".m4a"}),
+    "video": ("#d2691e", {".mp4", ".mkv", ".avi", ".mov", ".webm"}),
+}
+
+
+def cache_key(path, entry, size=THUMBNAIL_SIZE):
+    """Clé de cache : change dès que le fichier (date ou taille) change"""
+    raw = f"{path}\0{entry.mtime!r}\0{entry.size}\0{size}".encode("utf-8", "surrogateescape")
+    return hashlib.sha1(raw).hexdigest()
+
+
+def render_thumbnail(src, dest, size):
+    """Décode src, le réduit à size×size et l'écrit en PNG dans dest (processus du pool)"""
+    try:
+        from PIL import Image
+        with Image.open(src) as image:
+            image.draft("RGB", (size, size))  # Décodage JPEG réduit directement
+            image.thumbnail((size, size))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            with replacing(dest) as tmp:
+                image.save(tmp, "PNG")
+        return dest
+    except Exception:
+        return None
+
+
+class TypeIcons:
+    """Icônes 16×16 par famille d'extensions, dessinées sans PIL"""
+
+    def __init__(self, default_icon):
+        self.default_icon = default_icon
+        self._by_ext = {}
+        for color, extensions in TYPE_COLORS.values():
+            image = self._draw(color)
+            for ext in extensions:
+                self._by_ext[ext] = image
+
+    def icon_for(self, ext):
+        return self._by_ext.get(ext, self.default_icon)
+
+    @staticmethod
+    def _draw(color):
+        # Page blanche bordée, avec une bande de couleur
+        image = tk.PhotoImage(width=16, height=16)
+        image.put("#808080", to=(2, 0, 14, 16))
+        image.put("#ffffff", to=(3, 1, 13, 15))
+        image.put(color, to=(3, 9, 13, 14))
+        return image
+
+
+class ThumbnailCache:
+    """Miniatures : LRU de PhotoImage, cache disque et rendu dans un pool de processus
+
+    get() ne bloque jamais : il retourne None tant que la miniature n'est
+    pas prête ; les clés terminées arrivent dans self.ready.
+    """
+
+    def __init__(self, size=THUMBNAIL_SIZE, directory=None, max_images=MAX_IMAGES):
+        self.size = size
+        self.directory = directory or cache_dir("thumbnails")
+        self.max_images = max_images
+        self.ready = queue.Queue()
+        self._images = OrderedDict()
+        self._pending = {}
+        self._failed = set()
+        self._pool = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError:
+            self.directory = None
+
+    def get(self, path, entry):
+        """PhotoImage de la miniature de path, ou None (rendu lancé si besoin)"""
+        if self.directory is None:
+            return None
+        key = cache_key(path, entry, self.size)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+        if key in self._pending or key in self._failed:
+            return None
+        dest = os.path.join(self.directory, key + ".png")
+        if os.path.exists(dest):
+            return self._load(key, dest)
+        future = self._executor().submit(render_thumbnail, path, dest, self.size)
+        self._pending[key] = future
+        future.add_done_callback(lambda f, key=key: self.ready.put(key))
+        return None
+
+    def collect(self):
+        """Traite les rendus terminés ; retourne True si une miniature est prête"""
+        changed = False
+        while True:
+            try:
+                key = self.ready.get_nowait()
+            except queue.Empty:
+                return changed
+            future = self._pending.pop(key, None)
+            if future is None or future.cancelled():
+                continue
+            dest = future.result()
+            if dest is None:
+                self._failed.add(key)
+            else:
+                changed = self._load(key, dest) is not None or changed
+
+    def cancel_pending(self):
+        """Abandonne les rendus pas encore commencés (changement de dossier)"""
+        for key, future in list(self._pending.items()):
+            if future.cancel():
+                del self._pending[key]
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _executor(self):
+        if self._pool is None:
+            # Importés au premier rendu seulement, pour un démarrage plus rapide
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn : les processus de rendu n'héritent pas de l'état de Tk
+            self._pool = ProcessPoolExecutor(RENDER_WORKERS,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _load(self, key, dest):
+        try:
+            image = tk.PhotoImage(file=dest)
+        except tk.TclError:
+            self._failed.add(key)
+            return None
+        self._images[key] = image
+        while len(self._images) > self.max_images:
+            self._images.popitem(last=False)
+        return image
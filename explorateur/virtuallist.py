@@ -0,0 +1,211 @@
+"""Mode liste virtuelle pour ttk.Treeview
+
+Le listing complet reste dans une liste Python d'enregistrements ; seules
+les lignes visibles (plus une petite marge) existent dans le Treeview et
+sont recyclées au défilement. La barre de défilement verticale pilote le
+modèle, pas le widget.
+"""
+from tkinter import ttk
+
+from explorateur import instrument
+
+OVERSCAN = 4
+DEFAULT_ROW_HEIGHT = 20
+WHEEL_UNITS = 3
+
+
+class VirtualTreeview:
+    """Affiche une liste de n'importe quelle taille dans un Treeview à lignes recyclées
+
+    render_row(enregistrement) retourne (text, values, image, tags).
+    """
+
+    def __init__(self, tree, scrollbar, render_row, overscan=OVERSCAN):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.render_row = render_row
+        self.overscan = overscan
+        self.rows = []          # Le modèle : un enregistrement par élément
+        self.top = 0            # Index du premier enregistrement affiché
+        self.selected = set()   # Indices sélectionnés dans le modèle
+        self._items = []        # Lignes Treeview recyclées
+        self._shown = []        # Enregistrement affiché par chaque ligne
+        self._visible = 1
+
+        scrollbar.configure(command=self.yview)
+        tree.bind("<Configure>", self._on_configure, add="+")
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        tree.bind("<Button-1>", self._on_click, add="+")
+        tree.bind("<MouseWheel>", lambda e: self._scroll(-WHEEL_UNITS if e.delta > 0 else WHEEL_UNITS))
+        tree.bind("<Button-4>", lambda e: self._scroll(-WHEEL_UNITS))
+        tree.bind("<Button-5>", lambda e: self._scroll(WHEEL_UNITS))
+        tree.bind("<Up>", lambda e: self._move_cursor(-1))
+        tree.bind("<Down>", lambda e: self._move_cursor(1))
+        tree.bind("<Prior>", lambda e: self._move_cursor(-self._visible))
+        tree.bind("<Next>", lambda e: self._move_cursor(self._visible))
+        tree.bind("<Home>", lambda e: self._move_cursor(-len(self.rows)))
+        tree.bind("<End>", lambda e: self._move_cursor(len(self.rows)))
+
+    # --- Modèle ---------------------------------------------------------
+
+    def set_rows(self, rows):
+        """Remplace tout le modèle"""
+        self.rows = rows
+        self.top = 0
+        self.selected.clear()
+        self.refresh()
+
+    def reorder(self, rows):
+        """Remplace le modèle par une permutation de lui-même, sélection conservée"""
+        chosen = {id(self.rows[i]) for i in self.selected if i < len(self.rows)}
+        self.rows = rows
+        self.selected = {i for i, r in enumerate(rows) if id(r) in chosen} if chosen else set()
+        self.refresh()
+
+    def extend(self, rows):
+        """Ajoute des enregistrements à la fin du modèle"""
+        first = len(self.rows)
+        self.rows.extend(rows)
+        if first < self.top + self._capacity():
+            self.refresh()
+        else:
+            self._update_scrollbar()
+
+    def insert_row(self, index, record):
+        """Insère un enregistrement dans le modèle à la position index"""
+        self.rows.insert(index, record)
+        self.selected = {i + 1 if i >= index else i for i in self.selected}
+        if index < self.top:
+            self.top += 1  # Garder le même contenu à l'écran
+        self.refresh()
+
+    def remove_row(self, index):
+        """Retire l'enregistrement à la position index du modèle"""
+        del self.rows[index]
+        self.selected = {i - 1 if i > index else i for i in self.selected if i != index}
+        if index < self.top:
+            self.top -= 1
+        self.refresh()
+
+    def index_of(self, item):
+        """Index dans le modèle de la ligne Treeview item (ou None)"""
+        try:
+            return self.top + self._items.index(item)
+        except ValueError:
+            return None
+
+    def record(self, item):
+        """Enregistrement affiché par la ligne Treeview item"""
+        index = self.index_of(item)
+        return None if index is None else self.rows[index]
+
+    def selected_rows(self):
+        """Enregistrements sélectionnés, dans l'ordre du modèle"""
+        return [self.rows[i] for i in sorted(self.selected) if i < len(self.rows)]
+
+    # --- Affichage ------------------------------------------------------
+
+    @instrument.timed("affichage")
+    def refresh(self, force=False):
+        """Met à jour les lignes matérialisées à partir du modèle
+
+        Les lignes qui affichent déjà le bon enregistrement ne sont pas
+        retouchées, sauf si force est vrai.
+        """
+        tree = self.tree
+        self.top = max(0, min(self.top, len(self.rows) - self._visible))
+        needed = max(0, min(self._capacity(), len(self.rows) - self.top))
+
+        while len(self._items) < needed:
+            self._items.append(tree.insert("", "end"))
+            self._shown.append(None)
+        if len(self._items) > needed:
+            tree.delete(*self._items[needed:])
+            del self._items[needed:], self._shown[needed:]
+
+        for slot, item in enumerate(self._items):
+            record = self.rows[self.top + slot]
+            if force or self._shown[slot] is not record:
+                self._paint(item, record)
+                self._shown[slot] = record
+
+        wanted = tuple(item for slot, item in enumerate(self._items)
+                       if self.top + slot in self.selected)
+        if wanted != tree.selection():
+            tree.selection_set(wanted)
+        tree.yview_moveto(0)
+        self._update_scrollbar()
+
+    def see(self, index):
+        """Fait défiler le modèle pour rendre index visible"""
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self._visible:
+            self.top = index - self._visible + 1
+        self.refresh()
+
+    def yview(self, *args):
+        """Commande de la barre de défilement (moveto / scroll)"""
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.rows))
+            self.refresh()
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self._scroll(step * self._visible if args[2] == "pages" else step)
+
+    def _paint(self, item, record):
+        text, values, image, tags = self.render_row(record)
+        self.tree.item(item, text=text, values=values, image=image or "", tags=tags)
+
+    def _capacity(self):
+        return self._visible + self.overscan
+
+    def _update_scrollbar(self):
+        total = len(self.rows)
+        if total <= self._visible:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self._visible) / total))
+
+    def _scroll(self, units):
+        self.top += units
+        self.refresh()
+        return "break"
+
+    # --- Événements -----------------------------------------------------
+
+    def _on_configure(self, event):
+        row_height = ttk.Style().lookup("Treeview", "rowheight")
+        row_height = int(row_height) if row_height else DEFAULT_ROW_HEIGHT
+        # Une ligne de moins pour l'en-tête des colonnes
+        visible = max(1, event.height // row_height - 1)
+        if visible != self._visible:
+            self._visible = visible
+            self.refresh()
+
+    def _on_click(self, event):
+        # Un clic simple remplace la sélection, y compris hors de l'écran
+        if not event.state & 0x0005 and self.tree.identify_region(event.x, event.y) in ("tree", "cell"):
+            self.selected.clear()
+
+    def _on_select(self, event):
+        shown = {item: self.top + slot for slot, item in enumerate(self._items)}
+        picked = {shown[item] for item in self.tree.selection() if item in shown}
+        if str(self.tree.cget("selectmode")) == "browse":
+            if picked:
+                self.selected = picked
+            return
+        end = self.top + len(self._items)
+        self.selected = {i for i in self.selected if not self.top <= i < end} | picked
+
+    def _move_cursor(self, delta):
+        if not self.rows:
+            return "break"
+        focus = self.index_of(self.tree.focus())
+        if focus is None:
+            focus = max(self.selected) if self.selected else self.top
+        index = max(0, min(len(self.rows) - 1, focus + delta))
+        self.selected = {index}
+        self.see(index)
+        self.tree.focus(self._items[index - self.top])
+        return "break"
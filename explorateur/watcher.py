@@ -0,0 +1,179 @@
+"""Surveillance d'un dossier : inotify sur Linux, sinon scrutation du mtime
+
+Les surveillants tournent dans un thread et appellent
+on_change(changes), où changes associe à chaque nom modifié son nouvel
+Entry, ou None si l'élément a disparu. Seuls les éléments touchés sont
+stat-és.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+
+from explorateur.listing import stat_entry
+
+POLL_INTERVAL = 1.0  # Secondes entre deux vérifications du mtime (scrutation)
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+
+def _fingerprint(entry):
+    # La taille d'un dossier est calculée à part (dirsize) : elle n'entre pas en compte
+    return entry.is_dir, None if entry.is_dir else entry.size, entry.mtime
+
+
+def snapshot(entries):
+    """Empreinte (type, taille, date) par nom, pour diff_listing"""
+    return {e.name: _fingerprint(e) for e in entries}
+
+
+def diff_listing(old, new_entries):
+    """Changements entre une empreinte et un nouveau listing"""
+    changes = {}
+    for entry in new_entries:
+        if old.pop(entry.name, None) != _fingerprint(entry):
+            changes[entry.name] = entry
+    for name in old:
+        changes[name] = None
+    return changes
+
+
+class _Watcher:
+    def __init__(self, path, on_change):
+        self.path = path
+        self.on_change = on_change
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _emit(self, names):
+        changes = {name: stat_entry(self.path, name) for name in names}
+        if changes and not self._stop.is_set():
+            self.on_change(changes)
+
+
+class InotifyWatcher(_Watcher):
+    """Surveillant basé sur inotify (via ctypes)"""
+
+    def __init__(self, path, on_change):
+        super().__init__(path, on_change)
+        libc = _load_libc()
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        if libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, "inotify_add_watch", path)
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                names = set()
+                offset = 0
+                while offset < len(data):
+                    _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                    offset += _EVENT_HEADER.size
+                    name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                    offset += length
+                    if mask & (IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF):
+                        # File débordée ou dossier disparu : tout revérifier
+                        self.on_change(None)
+                        names.clear()
+                        break
+                    if name:
+                        names.add(name)
+                self._emit(names)
+        finally:
+            os.close(self._fd)
+
+
+class PollingWatcher(_Watcher):
+    """Surveillant de secours : compare le mtime du dossier à intervalle régulier
+
+    Détecte créations, suppressions et renommages ; les modifications
+    sur place d'un fichier ne changent pas le mtime du dossier.
+    """
+
+    def __init__(self, path, on_change, interval=POLL_INTERVAL):
+        super().__init__(path, on_change)
+        self.interval = interval
+
+    def _run(self):
+        mtime_ns, names = self._read()
+        while not self._stop.wait(self.interval):
+            try:
+                current = os.stat(self.path).st_mtime_ns
+            except OSError:
+                self.on_change(None)
+                return
+            if current == mtime_ns:
+                continue
+            mtime_ns, new_names = self._read()
+            self._emit(names ^ new_names)
+            names = new_names
+
+    def _read(self):
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+            with os.scandir(self.path) as it:
+                return mtime_ns, {d.name for d in it}
+        except OSError:
+            return None, set()
+
+
+def watch(path, on_change):
+    """Démarre le meilleur surveillant disponible pour path"""
+    if _load_libc() is not None:
+        try:
+            return InotifyWatcher(path, on_change).start()
+        except OSError:
+            pass  # Limite de surveillances atteinte, système de fichiers non supporté...
+    return PollingWatcher(path, on_change).start()
@@ -0,0 +1,157 @@
+"""File des opérations : annulation, reprise, erreurs inattendues"""
+import os
+import threading
+
+from explorateur import fileops
+from explorateur.fileops import COPY, DELETE, MOVE, FileJob, FileOperationQueue
+
+TIMEOUT = 10
+
+
+class BlockingJob(FileJob):
+    """Occupe le thread des opérations jusqu'à ce que gate soit levé"""
+
+    def __init__(self, gate):
+        super().__init__(DELETE, [])
+        self.gate = gate
+
+    def run(self):
+        self.gate.wait(TIMEOUT)
+        super().run()
+
+
+def make_file(path, size):
+    data = os.urandom(size)
+    with open(path, "wb") as f:
+        f.write(data)
+    return data
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_cancel_while_queued(tmp_path):
+    src = tmp_path / "a.bin"
+    make_file(src, 1000)
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    ops = FileOperationQueue()
+    gate = threading.Event()
+    ops.submit(BlockingJob(gate))
+    job = ops.submit(FileJob(COPY, [src], str(dest)))
+    job.cancel()
+    gate.set()
+    assert ops.finished.get(timeout=TIMEOUT).state == "done"
+    assert ops.finished.get(timeout=TIMEOUT) is job
+    assert job.state == "cancelled"
+    assert not os.listdir(dest)
+
+    job.resume()
+    ops.submit(job)
+    assert ops.finished.get(timeout=TIMEOUT) is job
+    assert job.state == "done"
+    assert read(dest / "a.bin") == read(src)
+
+
+def test_resume_mid_file(tmp_path, monkeypatch):
+    src = tmp_path / "gros.bin"
+    data = make_file(src, 10 * 1024)
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    job = FileJob(COPY, [src], str(dest))
+    copy_range = fileops._copy_range
+
+    def copy_then_cancel(src_fd, dst_fd, offset, count):
+        job.cancel()  # Interrompu après le premier bloc
+        return copy_range(src_fd, dst_fd, offset, count)
+
+    monkeypatch.setattr(fileops, "CHUNK", 1024)
+    monkeypatch.setattr(fileops, "_copy_range", copy_then_cancel)
+    job.run()
+    assert job.state == "cancelled"
+    assert job.done_bytes == 1024
+
+    monkeypatch.setattr(fileops, "_copy_range", copy_range)
+    job.resume()
+    job.run()
+    assert job.state == "done"
+    assert job.done_bytes == len(data)
+    assert read(dest / "gros.bin") == data
+
+
+def test_unexpected_error_keeps_queue_running(tmp_path, monkeypatch):
+    def broken_plan(self):
+        raise TypeError("plan")
+
+    src = tmp_path / "a.bin"
+    make_file(src, 10)
+    ops = FileOperationQueue()
+    with monkeypatch.context() as m:
+        m.setattr(FileJob, "_make_plan", broken_plan)
+        failed = ops.submit(FileJob(DELETE, [src]))
+        assert ops.finished.get(timeout=TIMEOUT) is failed
+    assert failed.state == "error"
+    assert isinstance(failed.error, TypeError)
+
+    job = ops.submit(FileJob(DELETE, [src]))
+    assert ops.finished.get(timeout=TIMEOUT) is job
+    assert job.state == "done"
+    assert not src.exists()
+
+
+def test_same_name_sources(tmp_path):
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    contents = []
+    for folder in ("x", "y"):
+        (tmp_path / folder).mkdir()
+        contents.append(make_file(tmp_path / folder / "a.txt", 100))
+
+    for kind in (COPY, MOVE):
+        job = FileJob(kind, [tmp_path / "x" / "a.txt", tmp_path / "y" / "a.txt"], str(dest))
+        job.run()
+        assert job.state == "done", job.error
+    assert sorted(os.listdir(dest)) == [
+        "a (copie 2).txt", "a (copie 3).txt", "a (copie).txt", "a.txt"]
+    assert read(dest / "a.txt") == read(dest / "a (copie 2).txt") == contents[0]
+    assert read(dest / "a (copie).txt") == read(dest / "a (copie 3).txt") == contents[1]
+
+
+def test_move_into_own_folder(tmp_path):
+    data = make_file(tmp_path / "a", 100)
+    job = FileJob(MOVE, [tmp_path / "a"], str(tmp_path))
+    job.run()
+    assert job.state == "done", job.error
+    assert os.listdir(tmp_path) == ["a"]
+    assert read(tmp_path / "a") == data
+
+
+def test_deep_tree(tmp_path):
+    root = tmp_path / "profond"
+    path = str(root)
+    os.mkdir(path)
+    for _ in range(1200):  # Plus que la limite de récursion de Python
+        path = os.path.join(path, "d")
+        os.mkdir(path)
+    make_file(os.path.join(path, "f"), 10)
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    try:
+        copy = FileJob(COPY, [root], str(dest))
+        copy.run()
+        assert copy.state == "done", copy.error
+        copied = os.path.join(dest, os.path.relpath(path, tmp_path), "f")
+        assert read(copied) == read(os.path.join(path, "f"))
+
+        delete = FileJob(DELETE, [root, dest / "profond"])
+        delete.run()
+        assert delete.state == "done", delete.error
+        assert not root.exists()
+    finally:
+        # shutil.rmtree (nettoyage de pytest) est récursif : ne rien laisser de profond
+        for leftover in (root, dest / "profond"):
+            if leftover.exists():
+                FileJob(DELETE, [leftover]).run()